@@ -1,64 +1,215 @@
-from flask import Flask, render_template, request, jsonify, redirect, session, flash, Response, render_template_string
-import requests
+from flask import Flask, render_template, request, jsonify, redirect, session, flash, Response, render_template_string, send_file, abort
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
+from collections.abc import Mapping
 from datetime import datetime
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-import base64
+import hashlib
+import hmac
 import uuid
 import traceback
 import time
 from weasyprint import HTML, CSS
 from io import BytesIO
 from resume_generator import generate_complete_resume
+from cache import SingleFlight
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from github_client import GitHubClient, GITHUB_API_URL
+from github_graphql import GraphQLFetcher
+from github_fixtures import GitHubFixtures
+from github_async import AsyncGitHubFetcher, HTTPX_AVAILABLE
+from github_languages import LanguageStats
+from github_sync import GitHubSync, insert_by_updated_at
+from snapshot_store import SnapshotStore
+from project_store import VersionConflict, empty_gallery, open_project_store
+from blob_store import BlobStore, image_src, migrate_inline_images, referenced_digests
+from categorizer import CategoryRules
+from project_record import ProjectRecord
+from project_view import ProjectView
+from project_processing import (
+    PROJECT_COLORS,
+    ProjectMemo,
+    build_github_project,
+    get_project_gallery
+)
 
 load_dotenv()
 
 app = Flask(__name__, template_folder='templates')
+
+class PortfolioJSONProvider(DefaultJSONProvider):
+    """jsonify() e |tojson aceitam os projetos compactos (ProjectRecord)
+    e as visões imutáveis dos dados locais (MappingProxyType)"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, ProjectRecord):
+            return o.to_dict()
+        if isinstance(o, Mapping):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+app.json = PortfolioJSONProvider(app)
+app.jinja_env.filters['image_src'] = image_src
 app.secret_key = os.environ.get('SECRET_KEY', 'rudieri_advanced_portfolio_2024')
 
 # Configurações
 GITHUB_USERNAME = os.environ.get('GITHUB_USERNAME', 'rudirimachado')
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', '31270032')
+GITHUB_WEBHOOK_SECRET = os.environ.get('GITHUB_WEBHOOK_SECRET', '')
+GITHUB_SYNC_INTERVAL = int(os.environ.get('GITHUB_SYNC_INTERVAL', 300))
+SNAPSHOT_DB_FILE = os.environ.get('SNAPSHOT_DB_FILE', 'portfolio_cache.db')
+PORTFOLIO_DATA_FILE = 'portfolio_data.json'
+PROJECT_STORE_BACKEND = os.environ.get('PROJECT_STORE_BACKEND', 'json')
+PROJECT_STORE_DB_FILE = os.environ.get('PROJECT_STORE_DB_FILE', 'portfolio_data.db')
+PROJECT_LOG_COMPACT_EVERY = int(os.environ.get('PROJECT_LOG_COMPACT_EVERY', 500))
+GALLERY_BLOB_DIR = os.environ.get('GALLERY_BLOB_DIR', 'gallery_blobs')
+GALLERY_BLOB_GC_GRACE = int(os.environ.get('GALLERY_BLOB_GC_GRACE', 3600))
+GITHUB_VALIDATORS_FILE = os.environ.get('GITHUB_VALIDATORS_FILE', 'github_validators.db')
+GITHUB_PAGE_WORKERS = int(os.environ.get('GITHUB_PAGE_WORKERS', 4))
+GITHUB_CONNECT_TIMEOUT = float(os.environ.get('GITHUB_CONNECT_TIMEOUT', 3.05))
+GITHUB_READ_TIMEOUT = float(os.environ.get('GITHUB_READ_TIMEOUT', 10))
+GITHUB_MAX_RETRIES = int(os.environ.get('GITHUB_MAX_RETRIES', 3))
+GITHUB_RATE_LIMIT_WATERMARK = int(os.environ.get('GITHUB_RATE_LIMIT_WATERMARK', 50))
+GITHUB_API_BASE_URL = os.environ.get('GITHUB_API_URL', GITHUB_API_URL)
+# Fixtures: 'record' grava as respostas reais, 'replay' reproduz sem rede
+GITHUB_FIXTURES_MODE = os.environ.get('GITHUB_FIXTURES_MODE', '')
+GITHUB_FIXTURES_DIR = os.environ.get('GITHUB_FIXTURES_DIR', 'github_fixtures')
+# Motores de busca: 'async' (httpx), 'sync' (requests) ou 'graphql' (exige token)
+GITHUB_FETCH_ENGINE = os.environ.get('GITHUB_FETCH_ENGINE', 'async' if HTTPX_AVAILABLE else 'sync')
+GITHUB_ASYNC_CONCURRENCY = int(os.environ.get('GITHUB_ASYNC_CONCURRENCY', 8))
+# Uma chamada por repositório: sem token (60/h) fica desligado, a não ser que pedido
+GITHUB_FETCH_LANGUAGES = os.environ.get('GITHUB_FETCH_LANGUAGES', 'true' if GITHUB_TOKEN else 'false').lower() in ('1', 'true', 'yes')
+GITHUB_BREAKER_ERROR_RATE = float(os.environ.get('GITHUB_BREAKER_ERROR_RATE', 0.5))
+GITHUB_BREAKER_SLOW_CALL = float(os.environ.get('GITHUB_BREAKER_SLOW_CALL', 5))
+GITHUB_BREAKER_RESET = int(os.environ.get('GITHUB_BREAKER_RESET', 60))
+# Regras de categorização automática (relidas quando o arquivo muda)
+CATEGORY_RULES_FILE = os.environ.get('CATEGORY_RULES_FILE', 'category_rules.json')
 
 print(f"🔧 Configurações carregadas:")
 print(f"   - GITHUB_USERNAME: {GITHUB_USERNAME}")
 print(f"   - GITHUB_TOKEN: {'✅ Configurado' if GITHUB_TOKEN else '❌ Não configurado'}")
 print(f"   - ADMIN_PASSWORD: {'✅ Configurado' if ADMIN_PASSWORD else '❌ Não configurado'}")
+print(f"   - GITHUB_SYNC_INTERVAL: {GITHUB_SYNC_INTERVAL}s")
+print(f"   - GITHUB_FETCH_ENGINE: {GITHUB_FETCH_ENGINE}")
+print(f"   - CATEGORY_RULES_FILE: {CATEGORY_RULES_FILE}")
+print(f"   - PROJECT_STORE_BACKEND: {PROJECT_STORE_BACKEND}")
+if GITHUB_FIXTURES_MODE:
+    print(f"   - GITHUB_FIXTURES: {GITHUB_FIXTURES_MODE} em {GITHUB_FIXTURES_DIR}/")
+print(f"   - GITHUB_WEBHOOK_SECRET: {'✅ Configurado' if GITHUB_WEBHOOK_SECRET else '❌ Não configurado (webhook desativado)'}")
+
+# Cliente GitHub: sessão com keep-alive, retries e ETag/Last-Modified persistidos
+github_client = GitHubClient(
+    token=GITHUB_TOKEN,
+    validators_path=GITHUB_VALIDATORS_FILE,
+    page_workers=GITHUB_PAGE_WORKERS,
+    connect_timeout=GITHUB_CONNECT_TIMEOUT,
+    read_timeout=GITHUB_READ_TIMEOUT,
+    max_retries=GITHUB_MAX_RETRIES,
+    rate_limit_watermark=GITHUB_RATE_LIMIT_WATERMARK,
+    breaker=CircuitBreaker(
+        name='github',
+        error_rate=GITHUB_BREAKER_ERROR_RATE,
+        slow_call_seconds=GITHUB_BREAKER_SLOW_CALL,
+        reset_timeout=GITHUB_BREAKER_RESET
+    ),
+    api_url=GITHUB_API_BASE_URL,
+    fixtures=GitHubFixtures(GITHUB_FIXTURES_DIR, GITHUB_FIXTURES_MODE) if GITHUB_FIXTURES_MODE else None
+)
+
+# Modo GraphQL: perfil + repositórios com linguagens e tópicos em poucas consultas
+github_graphql_fetcher = None
+if GITHUB_FETCH_ENGINE == 'graphql':
+    if GITHUB_TOKEN:
+        github_graphql_fetcher = GraphQLFetcher(github_client)
+    else:
+        print("⚠️ GITHUB_FETCH_ENGINE=graphql exige GITHUB_TOKEN - usando REST")
+
+# Motor assíncrono (httpx): usuário, páginas e extras buscados em paralelo
+github_async_fetcher = None
+if GITHUB_FETCH_ENGINE in ('async', 'graphql') and HTTPX_AVAILABLE:
+    github_async_fetcher = AsyncGitHubFetcher(github_client, concurrency=GITHUB_ASYNC_CONCURRENCY)
+
+# Snapshots compartilhados entre os workers (dados do GitHub e projetos processados)
+snapshot_store = SnapshotStore(SNAPSHOT_DB_FILE)
+snapshot_store.register_decoder('github_projects', lambda value: {
+    **value,
+    'projects': [ProjectRecord.from_dict(project) for project in value['projects']]
+})
+
+# Bytes por linguagem de cada repositório, rebuscados só após um push
+language_stats = LanguageStats(github_client, snapshot_store, github_async_fetcher) if GITHUB_FETCH_LANGUAGES else None
+
+# Requisições simultâneas compartilham um único processamento dos projetos
+projects_flight = SingleFlight()
+
+# Projetos já processados neste worker (reprocessa só o que mudou)
+category_rules = CategoryRules(CATEGORY_RULES_FILE)
+project_memo = ProjectMemo(category_rules)
+
+# Projetos por categoria + estatísticas, atualizados a cada mudança
+project_view = ProjectView()
+
+# Dados locais (projetos customizados, metadados e galerias): JSON ou SQLite
+project_store = open_project_store(
+    PROJECT_STORE_BACKEND,
+    PORTFOLIO_DATA_FILE,
+    PROJECT_STORE_DB_FILE,
+    compact_every=PROJECT_LOG_COMPACT_EVERY
+)
+
+# Imagens das galerias em disco, por hash do conteúdo (as galerias guardam só o hash)
+blob_store = BlobStore(GALLERY_BLOB_DIR)
+migrate_inline_images(project_store, blob_store)
 
 def load_project_data():
     """Carrega dados dos projetos incluindo galerias"""
-    try:
-        with open('portfolio_data.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print(f"📂 Dados carregados: {len(data.get('custom_projects', []))} custom, {len(data.get('github_metadata', {}))} github meta")
-            return data
-    except Exception as e:
-        print(f"📂 Criando arquivo de dados novo: {e}")
-        return {
-            'custom_projects': [],
-            'github_metadata': {},
-            'project_galleries': {}
-        }
+    return project_store.load()
+
+def project_data_stamp():
+    """Identifica a versão dos dados locais (muda a cada gravação)"""
+    return project_store.stamp()
+
+def if_match_version():
+    """Versão que o cliente mandou no If-Match (None sem o cabeçalho)"""
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    for tag in request.if_match.as_set():
+        if tag.startswith('v') and tag[1:].isdigit():
+            return int(tag[1:])
+    # ETag que não é de versão nunca confere
+    return -1
+
+def versioned_response(payload, version):
+    """JSON com o ETag da versão do documento (para o If-Match seguinte)"""
+    response = jsonify(payload)
+    response.set_etag(f"v{version}")
+    return response
 
-def save_project_data(data):
-    """Salva dados dos projetos"""
+def version_conflict_response(conflict):
+    """412: o documento mudou desde a versão que o cliente tinha"""
+    response = versioned_response({
+        'error': 'O projeto foi alterado por outra requisição - recarregue e tente de novo',
+        'current_version': conflict.current_version
+    }, conflict.current_version)
+    return response, 412
+
+def project_data_changed():
+    """Chamado após cada gravação dos dados locais"""
+    # Atualiza a visão dos projetos já na gravação (a próxima página não espera)
     try:
-        with open('portfolio_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print("💾 Dados salvos com sucesso")
-        return True
+        refresh_project_view()
     except Exception as e:
-        print(f"💾 Erro ao salvar: {e}")
-        return False
+        print(f"📋 Erro ao atualizar a visão dos projetos: {e}")
 
 def process_uploaded_file(file):
-    """Processa arquivo de imagem/GIF para base64"""
+    """Grava a imagem/GIF no blob store (uploads idênticos viram um blob só)"""
     try:
         file_data = file.read()
-        file_b64 = base64.b64encode(file_data).decode('utf-8')
+        file_hash = blob_store.put(file_data)
         file_ext = file.filename.split('.')[-1].lower()
         
         mime_types = {
@@ -72,7 +223,7 @@ def process_uploaded_file(file):
         mime_type = mime_types.get(file_ext, 'image/png')
         
         return {
-            'data': f"data:{mime_type};base64,{file_b64}",
+            'hash': file_hash,
             'filename': file.filename,
             'size': len(file_data),
             'type': file_ext,
@@ -82,257 +233,261 @@ def process_uploaded_file(file):
         print(f"📁 Erro ao processar arquivo: {e}")
         return None
 
+def fetch_github_data():
+    """Busca dados completos do GitHub com debug detalhado (sem cache)"""
+    print(f"🔍 === INICIANDO BUSCA GITHUB ===")
+    print(f"👤 Username: {GITHUB_USERNAME}")
+    print(f"🔑 Token: {'✅ Configurado (' + str(len(GITHUB_TOKEN)) + ' chars)' if GITHUB_TOKEN else '❌ Não configurado'}")
+    print(f"⚙️ Motor: {'graphql' if github_graphql_fetcher else 'assíncrono' if github_async_fetcher else 'síncrono'}")
+    
+    if github_graphql_fetcher:
+        # Linguagens já vêm na própria consulta
+        user_data, repos_data = github_graphql_fetcher.fetch_user_and_repos(GITHUB_USERNAME)
+    elif github_async_fetcher:
+        user_data, repos_data = github_async_fetcher.fetch_user_and_repos(GITHUB_USERNAME)
+    else:
+        user_data, repos_data = fetch_github_data_sync()
+    
+    if language_stats and repos_data and not github_graphql_fetcher:
+        repos_data = language_stats.enrich(repos_data)
+    
+    # Lista vazia com repositórios públicos no perfil: resposta incompleta,
+    # não deve substituir o último snapshot bom
+    if not repos_data and user_data.get('public_repos'):
+        raise ValueError(f"GitHub retornou 0 repositórios, perfil indica {user_data['public_repos']}")
+    
+    print(f"🔍 === BUSCA GITHUB FINALIZADA ===")
+    print(f"📊 Resultado: User={len(user_data)} keys, Repos={len(repos_data)} items")
+    
+    return user_data, repos_data
+
+def fetch_github_data_sync():
+    """Busca usuário e repositórios com o cliente síncrono (uma chamada após a outra)"""
+    # Dados do usuário
+    print("👤 Buscando dados do usuário...")
+    user_path = f'/users/{GITHUB_USERNAME}'
+    print(f"🌐 URL: {user_path}")
+    
+    user_response, user_data = github_client.get_json(user_path)
+    print(f"👤 Response Status: {user_response.status_code}")
+    
+    if user_data is not None:
+        print(f"✅ User OK - Nome: {user_data.get('name', 'N/A')}")
+        print(f"✅ Public Repos: {user_data.get('public_repos', 0)}")
+    else:
+        print(f"❌ Erro User: {user_response.status_code} - {user_response.text}")
+        user_data = {}
+    
+    # Repositórios
+    print("📁 Buscando repositórios...")
+    repos_path = f'/users/{GITHUB_USERNAME}/repos'
+    repos_params = {'sort': 'updated', 'per_page': 100}
+    print(f"🌐 URL: {repos_path}")
+    print(f"📋 Params: {repos_params}")
+    
+    repos_response, repos_data = github_client.get_paginated(repos_path, params=repos_params)
+    print(f"📁 Response Status: {repos_response.status_code}")
+    
+    if repos_data is not None:
+        print(f"✅ Repos OK - Encontrados: {len(repos_data)} repositórios")
+        
+        # Debug primeiros repos
+        if repos_data:
+            print("📋 Primeiros 3 repositórios:")
+            for i, repo in enumerate(repos_data[:3]):
+                print(f"  {i+1}. {repo['name']} ({repo.get('language', 'N/A')})")
+    else:
+        print(f"❌ Erro Repos: {repos_response.status_code} - {repos_response.text}")
+        # Erro não pode substituir o cache por uma lista vazia
+        repos_response.raise_for_status()
+        repos_data = []
+    
+    return user_data, repos_data
+
+# Sincronização em segundo plano: as rotas só leem o último snapshot publicado
+github_sync = GitHubSync(
+    fetch_github_data,
+    snapshot_store,
+    interval=GITHUB_SYNC_INTERVAL,
+    metrics=lambda: {
+        'rate_limit': github_client.governor.state(),
+        'circuit_breaker': github_client.breaker.metrics()
+    }
+)
+
+@app.before_request
+def start_github_sync():
+    github_sync.start()
+
+@app.before_request
+def reset_project_data_stats():
+    project_store.parse_stats.reset_request()
+
+@app.after_request
+def report_project_data_stats(response):
+    """Quantas vezes os dados locais foram decodificados nesta requisição"""
+    stats = project_store.parse_stats.request()
+    response.headers['X-Project-Data-Parses'] = str(stats['parses'])
+    response.headers['X-Project-Data-Bytes-Parsed'] = str(stats['bytes_parsed'])
+    if stats['parses']:
+        print(f"📂 {request.path}: dados locais decodificados {stats['parses']}x ({stats['bytes_parsed']} bytes)")
+    return response
+
 def get_github_data():
-    """Busca dados completos do GitHub com debug detalhado"""
+    """Dados do GitHub do último snapshot publicado (sem acessar a rede)"""
+    snapshot = github_sync.snapshot()
+    if not snapshot:
+        print("🛰️ Nenhum snapshot do GitHub publicado ainda")
+        return {}, []
+    
+    return snapshot.get('user', {}), snapshot.get('repos', [])
+
+def process_github_projects():
+    """Processa e combina projetos do GitHub com metadados locais ({}, [] em caso de erro)"""
     try:
-        print(f"🔍 === INICIANDO BUSCA GITHUB ===")
-        print(f"👤 Username: {GITHUB_USERNAME}")
-        print(f"🔑 Token: {'✅ Configurado (' + str(len(GITHUB_TOKEN)) + ' chars)' if GITHUB_TOKEN else '❌ Não configurado'}")
-        
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'Portfolio-Rudieri-App'
-        }
-        
-        if GITHUB_TOKEN:
-            headers['Authorization'] = f'token {GITHUB_TOKEN}'
-            print("✅ Header Authorization adicionado")
-        
-        # Dados do usuário
-        print("👤 Buscando dados do usuário...")
-        user_url = f'https://api.github.com/users/{GITHUB_USERNAME}'
-        print(f"🌐 URL: {user_url}")
-        
-        user_response = requests.get(user_url, headers=headers, timeout=15)
-        print(f"👤 Response Status: {user_response.status_code}")
-        
-        if user_response.status_code == 200:
-            user_data = user_response.json()
-            print(f"✅ User OK - Nome: {user_data.get('name', 'N/A')}")
-            print(f"✅ Public Repos: {user_data.get('public_repos', 0)}")
-        else:
-            print(f"❌ Erro User: {user_response.status_code} - {user_response.text}")
-            user_data = {}
-        
-        # Pausa para rate limit
-        time.sleep(0.5)
-        
-        # Repositórios
-        print("📁 Buscando repositórios...")
-        repos_url = f'https://api.github.com/users/{GITHUB_USERNAME}/repos'
-        repos_params = {'sort': 'updated', 'per_page': 100}
-        print(f"🌐 URL: {repos_url}")
-        print(f"📋 Params: {repos_params}")
-        
-        repos_response = requests.get(repos_url, headers=headers, params=repos_params, timeout=15)
-        print(f"📁 Response Status: {repos_response.status_code}")
-        
-        if repos_response.status_code == 200:
-            repos_data = repos_response.json()
-            print(f"✅ Repos OK - Encontrados: {len(repos_data)} repositórios")
-            
-            # Debug primeiros repos
-            if repos_data:
-                print("📋 Primeiros 3 repositórios:")
-                for i, repo in enumerate(repos_data[:3]):
-                    print(f"  {i+1}. {repo['name']} ({repo.get('language', 'N/A')})")
-        else:
-            print(f"❌ Erro Repos: {repos_response.status_code} - {repos_response.text}")
-            repos_data = []
-        
-        print(f"🔍 === BUSCA GITHUB FINALIZADA ===")
-        print(f"📊 Resultado: User={len(user_data)} keys, Repos={len(repos_data)} items")
-        
-        return user_data, repos_data
-        
+        return build_github_projects()
     except Exception as e:
-        print(f"💥 ERRO FATAL GitHub API: {e}")
-        print(f"💥 Stack trace: {traceback.format_exc()}")
+        print(f"💥 ERRO process_github_projects: {e}")
+        print(f"💥 Stack: {traceback.format_exc()}")
         return {}, []
 
-def auto_categorize_github_repo(repo_name, language, description):
-    """Categorização inteligente automática"""
-    text = f"{repo_name} {description or ''}".lower()
+@projects_flight.wrap('github_projects')
+def build_github_projects():
+    """Processa os projetos do GitHub; erros propagam (a visão não guarda um resultado falho)"""
+    print(f"🔄 === PROCESSANDO PROJETOS GITHUB ===")
     
-    # RPA/Automação
-    rpa_keywords = ['rpa', 'bot', 'robot', 'automation', 'scraping', 'selenium', 'scraper', 
-                   'spider', 'crawler', 'extractor', 'monitor', 'notificador', 'quickbook']
-    if any(keyword in text for keyword in rpa_keywords):
-        return 'rpa'
+    # Outro worker já processou esta combinação de snapshot + dados locais + regras?
+    category_rules.reload_if_changed()
+    source = [github_sync.version(), project_data_stamp(), category_rules.version]
+    cached_version, cached = snapshot_store.get('github_projects')
+    if cached and cached.get('source') == source:
+        print(f"🔄 Usando projetos processados compartilhados (versão {cached_version})")
+        return cached['user'], cached['projects']
+    
+    user_data, repos_data = get_github_data()
+    print(f"📊 API retornou: User keys={list(user_data.keys()) if user_data else 'vazio'}")
+    print(f"📊 API retornou: {len(repos_data)} repositórios")
+    
+    portfolio_data = load_project_data()
+    github_metadata = portfolio_data.get('github_metadata', {})
+    galleries = portfolio_data.get('project_galleries', {})
     
-    # Sistemas/Apps
-    system_keywords = ['system', 'erp', 'sysrohden', 'app', 'dashboard', 'admin', 
-                      'manager', 'platform', 'cms', 'crm', 'portal']
-    if any(keyword in text for keyword in system_keywords):
-        return 'sistema'
+    print(f"📂 Metadados locais: {len(github_metadata)} projetos")
+    print(f"🖼️ Galerias locais: {len(galleries)} projetos")
     
-    # APIs
-    api_keywords = ['api', 'rest', 'endpoint', 'service', 'microservice', 'backend']
-    if any(keyword in text for keyword in api_keywords):
-        return 'api'
+    # Só repositórios com chave nova (updated_at, metadados, galeria) são reprocessados
+    processed_projects, rebuilt = project_memo.process(
+        repos_data,
+        github_metadata,
+        galleries,
+        source[1]
+    )
+    print(f"♻️ {rebuilt} projetos reprocessados, {len(processed_projects) - rebuilt} reaproveitados do memo")
     
-    # Web/Frontend
-    web_keywords = ['website', 'web', 'frontend', 'react', 'vue', 'angular', 'html', 'css']
-    if any(keyword in text for keyword in web_keywords):
-        return 'web'
+    for i, project in enumerate(processed_projects[:3]):  # Debug dos primeiros 3
+        print(f"✅ Projeto {i+1}: {project['title']} ({project['category']})")
     
-    # Mobile
-    mobile_keywords = ['mobile', 'android', 'ios', 'flutter', 'react-native']
-    if any(keyword in text for keyword in mobile_keywords):
-        return 'mobile'
+    print(f"🔄 === PROCESSAMENTO FINALIZADO ===")
+    print(f"📊 Resultado: {len(processed_projects)} projetos processados")
     
-    return 'outros'
-
-def get_project_gallery(project_id, gallery_data):
-    """Obtém galeria de um projeto específico"""
-    return gallery_data.get(project_id, {
-        'main_image': '',
-        'images': [],
-        'modules': {}
+    snapshot_store.publish('github_projects', {
+        'source': source,
+        'user': user_data,
+        'projects': processed_projects
     })
+    
+    return user_data, processed_projects
 
-def process_github_projects():
-    """Processa e combina projetos do GitHub com metadados locais"""
-    print(f"🔄 === PROCESSANDO PROJETOS GITHUB ===")
+def update_processed_project(repo, github_version, base_version, removed=False):
+    """Atualiza só o projeto afetado no snapshot processado compartilhado.
+
+    Só vale se o snapshot processado veio exatamente da versão do GitHub
+    em que o webhook se baseou (`base_version`); senão ele perderia as
+    outras mudanças dessa versão e a próxima leitura processa tudo.
+    """
+    stamp = project_data_stamp()
+    cached_version, cached = snapshot_store.get('github_projects')
+    if not cached or cached.get('source') != [base_version, stamp, category_rules.version]:
+        # Sem snapshot processado válido: a próxima leitura processa tudo
+        return None
     
-    try:
-        user_data, repos_data = get_github_data()
-        print(f"📊 API retornou: User keys={list(user_data.keys()) if user_data else 'vazio'}")
-        print(f"📊 API retornou: {len(repos_data)} repositórios")
-        
+    project_id = f"github_{repo['id']}"
+    projects = [p for p in cached['projects'] if p['id'] != project_id]
+    previous = next((p for p in cached['projects'] if p['id'] == project_id), None)
+    
+    project = None
+    if not removed:
         portfolio_data = load_project_data()
-        github_metadata = portfolio_data.get('github_metadata', {})
-        galleries = portfolio_data.get('project_galleries', {})
-        
-        print(f"📂 Metadados locais: {len(github_metadata)} projetos")
-        print(f"🖼️ Galerias locais: {len(galleries)} projetos")
-        
-        colors = [
-            'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
-            'linear-gradient(135deg, #f093fb 0%, #f5576c 100%)',
-            'linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)',
-            'linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)',
-            'linear-gradient(135deg, #fa709a 0%, #fee140 100%)',
-            'linear-gradient(135deg, #a8edea 0%, #fed6e3 100%)',
-            'linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%)',
-            'linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%)',
-            'linear-gradient(135deg, #feca57 0%, #ff9ff3 100%)',
-            'linear-gradient(135deg, #54a0ff 0%, #5f27cd 100%)'
-        ]
-        
-        processed_projects = []
-        
-        for i, repo in enumerate(repos_data):
-            repo_id = str(repo['id'])
-            metadata = github_metadata.get(repo_id, {})
-            gallery = get_project_gallery(f"github_{repo_id}", galleries)
-            
-            # Categorização
-            category = metadata.get('category') or auto_categorize_github_repo(
-                repo['name'], 
-                repo.get('language'), 
-                repo.get('description')
-            )
-            
-            # Título
-            title = metadata.get('title') or repo['name'].replace('-', ' ').replace('_', ' ').title()
-            
-            # Descrição
-            description = metadata.get('description') or repo.get('description') or f"Projeto desenvolvido em {repo.get('language', 'Python')}"
-            
-            project = {
-                'id': f"github_{repo_id}",
-                'github_id': repo_id,
-                'title': title,
-                'description': description,
-                'category': category,
-                'source': 'github',
-                'github_url': repo['html_url'],
-                'demo_url': repo.get('homepage') or metadata.get('demo_url', ''),
-                'language': repo.get('language') or 'N/A',
-                'color': colors[i % len(colors)],
-                'main_image': gallery.get('main_image', ''),
-                'gallery': gallery.get('images', []),
-                'modules': gallery.get('modules', {}),
-                'tags': metadata.get('tags', []),
-                'featured': metadata.get('featured', False),
-                'created_at': repo['created_at'],
-                'updated_at': repo['updated_at'],
-                'stars': repo.get('stargazers_count', 0),
-                'forks': repo.get('forks_count', 0),
-                'size': repo.get('size', 0)
-            }
-            
-            processed_projects.append(project)
-            
-            if i < 3:  # Debug dos primeiros 3
-                print(f"✅ Projeto {i+1}: {title} ({category})")
-        
-        print(f"🔄 === PROCESSAMENTO FINALIZADO ===")
-        print(f"📊 Resultado: {len(processed_projects)} projetos processados")
-        
-        return user_data, processed_projects
-        
-    except Exception as e:
-        print(f"💥 ERRO process_github_projects: {e}")
-        print(f"💥 Stack: {traceback.format_exc()}")
-        return {}, []
+        project = build_github_project(
+            repo,
+            portfolio_data.get('github_metadata', {}).get(str(repo['id']), {}),
+            get_project_gallery(project_id, portfolio_data.get('project_galleries', {})),
+            previous['color'] if previous else PROJECT_COLORS[len(projects) % len(PROJECT_COLORS)],
+            category_rules.categorize(repo['name'], repo.get('description'))
+        )
+        insert_by_updated_at(projects, project)
+    
+    snapshot_store.publish('github_projects', {
+        'source': [github_version, stamp, category_rules.version],
+        'user': cached['user'],
+        'projects': projects
+    })
+    return project
 
-def organize_all_projects():
-    """Organiza TODOS os projetos por categoria"""
+def project_view_source():
+    """Versões de tudo que entra na visão: snapshot do GitHub, dados locais e regras"""
+    category_rules.reload_if_changed()
+    return [github_sync.version(), project_data_stamp(), category_rules.version]
+
+@projects_flight.wrap('all_projects')
+def refresh_project_view():
+    """Atualiza a visão materializada com o que mudou desde a última versão"""
     print(f"📋 === ORGANIZANDO TODOS OS PROJETOS ===")
     
+    source = project_view_source()
+    view = project_view.current()
+    if view['source'] == source:
+        return view
+    
+    # Erros propagam: a visão anterior continua valendo e a próxima leitura tenta de novo
+    user_data, github_projects = build_github_projects()
+    portfolio_data = load_project_data()
+    custom_projects = portfolio_data.get('custom_projects', [])
+    galleries = portfolio_data.get('project_galleries', {})
+    
+    print(f"📊 GitHub projects: {len(github_projects)}")
+    print(f"📊 Custom projects: {len(custom_projects)}")
+    
+    view = project_view.refresh(source, user_data, github_projects, custom_projects, galleries)
+    
+    # Debug das categorias
+    print(f"📋 Projetos por categoria:")
+    for cat, projects in view['projects'].items():
+        print(f"  - {cat}: {len(projects)} projetos")
+    
+    print(f"📋 === ORGANIZAÇÃO FINALIZADA ===")
+    
+    return view
+
+def get_project_view():
+    """Visão pronta dos projetos; só recalcula (incrementalmente) se algo mudou.
+
+    Se o recálculo falhar, serve a última visão boa (a próxima leitura tenta de novo).
+    """
+    view = project_view.current()
+    if view['source'] != project_view_source():
+        try:
+            view = refresh_project_view()
+        except Exception as e:
+            print(f"📋 Erro ao atualizar a visão dos projetos, servindo a anterior: {e}")
+            print(f"📋 Stack: {traceback.format_exc()}")
+    return view
+
+def organize_all_projects():
+    """Organiza TODOS os projetos por categoria"""
     try:
-        user_data, github_projects = process_github_projects()
-        portfolio_data = load_project_data()
-        custom_projects = portfolio_data.get('custom_projects', [])
-        galleries = portfolio_data.get('project_galleries', {})
-        
-        print(f"📊 GitHub projects: {len(github_projects)}")
-        print(f"📊 Custom projects: {len(custom_projects)}")
-        
-        # Adiciona galeria aos projetos customizados
-        for project in custom_projects:
-            gallery = get_project_gallery(project['id'], galleries)
-            project.update({
-                'main_image': gallery.get('main_image', project.get('image', '')),
-                'gallery': gallery.get('images', []),
-                'modules': gallery.get('modules', {})
-            })
-        
-        # Combina todos os projetos
-        all_projects = github_projects + custom_projects
-        print(f"📊 Total projects: {len(all_projects)}")
-        
-        # Organiza por categoria
-        categorized = {
-            'sistema': [],
-            'rpa': [],
-            'api': [],
-            'web': [],
-            'mobile': [],
-            'outros': []
-        }
-        
-        for project in all_projects:
-            category = project.get('category', 'outros')
-            if category in categorized:
-                categorized[category].append(project)
-            else:
-                categorized['outros'].append(project)
-        
-        # Ordena por featured primeiro, depois por data de atualização
-        for category in categorized:
-            categorized[category].sort(key=lambda x: (not x.get('featured', False), x.get('updated_at', '')), reverse=True)
-        
-        # Debug das categorias
-        print(f"📋 Projetos por categoria:")
-        for cat, projects in categorized.items():
-            print(f"  - {cat}: {len(projects)} projetos")
-        
-        print(f"📋 === ORGANIZAÇÃO FINALIZADA ===")
-        
-        return user_data, categorized, all_projects
+        view = get_project_view()
+        return view['user'], view['projects'], view['all_projects']
         
     except Exception as e:
         print(f"💥 ERRO organize_all_projects: {e}")
@@ -342,6 +497,31 @@ def organize_all_projects():
             'web': [], 'mobile': [], 'outros': []
         }, []
 
+def warm_start():
+    """Carrega o último snapshot bom do disco antes da primeira requisição.
+
+    As primeiras páginas após um deploy/restart são servidas com esses dados
+    enquanto a sincronização atualiza o GitHub em segundo plano.
+    """
+    started = time.time()
+    
+    try:
+        snapshot = github_sync.snapshot()
+        if not snapshot:
+            print("🧊 Nenhum snapshot do GitHub em disco; aguardando a primeira sincronização")
+        else:
+            user_data, github_projects = process_github_projects()
+            status = github_sync.status()
+            print(f"🧊 Snapshot carregado do disco em {time.time() - started:.3f}s: "
+                  f"{len(github_projects)} projetos (versão {status['version']}, "
+                  f"última sincronização {status.get('last_success_at', 'desconhecida')})")
+    except Exception as e:
+        print(f"🧊 Erro ao carregar snapshot do disco: {e}")
+    
+    github_sync.start()
+
+warm_start()
+
 # ===== ROTAS DE DEBUG =====
 
 @app.route('/test')
@@ -367,43 +547,42 @@ def debug_github():
         debug_info.append(f"✅ Token length: {len(GITHUB_TOKEN) if GITHUB_TOKEN else 0}")
         
         # Teste 2: Testar API diretamente
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-        if GITHUB_TOKEN:
-            headers['Authorization'] = f'token {GITHUB_TOKEN}'
-        
         debug_info.append("=" * 50)
         debug_info.append("🔍 TESTE API GITHUB DIRETA:")
         
-        # Teste usuário
-        user_response = requests.get(f'https://api.github.com/users/{GITHUB_USERNAME}', 
-                                   headers=headers, timeout=10)
+        debug_info.append(f"⚡ Circuit breaker: {github_client.breaker.state}")
         
-        debug_info.append(f"👤 User API Status: {user_response.status_code}")
+        try:
+            # Teste usuário
+            user_response = github_client.get(f'/users/{GITHUB_USERNAME}')
         
-        if user_response.status_code == 200:
-            user_data = user_response.json()
-            debug_info.append(f"✅ Nome: {user_data.get('name', 'N/A')}")
-            debug_info.append(f"✅ Public repos: {user_data.get('public_repos', 0)}")
-            debug_info.append(f"✅ Bio: {user_data.get('bio', 'N/A')}")
-        else:
-            debug_info.append(f"❌ Erro User: {user_response.text}")
+            debug_info.append(f"👤 User API Status: {user_response.status_code}")
         
-        # Teste repositórios
-        repos_response = requests.get(f'https://api.github.com/users/{GITHUB_USERNAME}/repos',
-                                    headers=headers, timeout=10)
+            if user_response.status_code == 200:
+                user_data = user_response.json()
+                debug_info.append(f"✅ Nome: {user_data.get('name', 'N/A')}")
+                debug_info.append(f"✅ Public repos: {user_data.get('public_repos', 0)}")
+                debug_info.append(f"✅ Bio: {user_data.get('bio', 'N/A')}")
+            else:
+                debug_info.append(f"❌ Erro User: {user_response.text}")
         
-        debug_info.append(f"📁 Repos API Status: {repos_response.status_code}")
+            # Teste repositórios
+            repos_response = github_client.get(f'/users/{GITHUB_USERNAME}/repos')
         
-        if repos_response.status_code == 200:
-            repos_data = repos_response.json()
-            debug_info.append(f"✅ Repos encontrados: {len(repos_data)}")
+            debug_info.append(f"📁 Repos API Status: {repos_response.status_code}")
+        
+            if repos_response.status_code == 200:
+                repos_data = repos_response.json()
+                debug_info.append(f"✅ Repos encontrados: {len(repos_data)}")
             
-            if repos_data:
-                debug_info.append("📋 Primeiros 5 repos:")
-                for repo in repos_data[:5]:
-                    debug_info.append(f"  - {repo['name']} ({repo.get('language', 'N/A')})")
-        else:
-            debug_info.append(f"❌ Erro Repos: {repos_response.text}")
+                if repos_data:
+                    debug_info.append("📋 Primeiros 5 repos:")
+                    for repo in repos_data[:5]:
+                        debug_info.append(f"  - {repo['name']} ({repo.get('language', 'N/A')})")
+            else:
+                debug_info.append(f"❌ Erro Repos: {repos_response.text}")
+        except CircuitOpenError as e:
+            debug_info.append(f"⚡ {e} - chamadas diretas suspensas, rotas usam o snapshot")
         
         # Teste função completa
         debug_info.append("=" * 50)
@@ -537,7 +716,8 @@ def portfolio():
     try:
         print(f"🏠 === CARREGANDO PÁGINA PRINCIPAL ===")
         
-        user_data, categorized_projects, all_projects = organize_all_projects()
+        view = get_project_view()
+        user_data, categorized_projects = view['user'], view['projects']
         
         portfolio_info = {
             'name': user_data.get('name') or 'Rudieri Machado',
@@ -549,12 +729,10 @@ def portfolio():
             'whatsapp': '47996609407',
             'instagram': 'https://www.instagram.com/rudieri.machado',
             'projects': categorized_projects,
+            'language_bytes': view['language_bytes'],
             'stats': {
                 'experience': '5+',
-                'systems': len(categorized_projects['sistema']),
-                'rpa': len(categorized_projects['rpa']),
-                'total': len(all_projects),
-                'languages': len(set([p.get('language', 'N/A') for p in all_projects if p.get('language')]))
+                **view['stats']
             }
         }
         
@@ -651,6 +829,106 @@ def api_get_projects():
         'user': user_data
     })
 
+@app.route('/api/sync/status', methods=['GET'])
+def api_sync_status():
+    """Status da sincronização com o GitHub"""
+    if 'admin_logged' not in session:
+        return jsonify({'error': 'Não autorizado'}), 401
+    
+    return jsonify({
+        'success': True,
+        'sync': github_sync.status(),
+        'single_flight': projects_flight.stats(),
+        'snapshot_store': snapshot_store.stats(),
+        'project_memo': project_memo.stats(),
+        'project_view': project_view.stats(),
+        'project_data': project_store.stats()
+    })
+
+@app.route('/api/sync/refresh', methods=['POST'])
+def api_sync_refresh():
+    """Pede uma sincronização imediata com o GitHub"""
+    if 'admin_logged' not in session:
+        return jsonify({'error': 'Não autorizado'}), 401
+    
+    github_sync.request_refresh()
+    return jsonify({'success': True, 'sync': github_sync.status()}), 202
+
+def verify_webhook_signature(body, signature):
+    """Confere o header X-Hub-Signature-256 enviado pelo GitHub"""
+    if not GITHUB_WEBHOOK_SECRET or not signature.startswith('sha256='):
+        return False
+    
+    expected = hmac.new(GITHUB_WEBHOOK_SECRET.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len('sha256='):])
+
+def normalize_webhook_repo(repo):
+    """Converte timestamps numéricos do evento push para o formato da API REST"""
+    repo = dict(repo)
+    for field in ('created_at', 'pushed_at', 'updated_at'):
+        if isinstance(repo.get(field), (int, float)):
+            repo[field] = datetime.utcfromtimestamp(repo[field]).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    if not repo.get('updated_at'):
+        repo['updated_at'] = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    return repo
+
+def webhook_repo_is_public(event, repo, action):
+    """O repositório do evento ainda é público e do GITHUB_USERNAME?
+
+    A busca REST/GraphQL só traz os repositórios públicos do dono; o
+    webhook não pode publicar nada além disso. As ações de remoção só
+    valem para o evento `repository` (`star`/`deleted` é uma estrela
+    retirada, não um repositório apagado).
+    """
+    if event == 'repository' and action in ('deleted', 'privatized', 'transferred'):
+        return False
+    if repo.get('private') or repo.get('visibility', 'public') != 'public':
+        return False
+    owner = repo.get('owner') or {}
+    login = owner.get('login') or owner.get('name') or ''
+    return login.lower() == GITHUB_USERNAME.lower()
+
+@app.route('/api/github/webhook', methods=['POST'])
+def api_github_webhook():
+    """Recebe eventos do GitHub e atualiza só o repositório afetado"""
+    if not verify_webhook_signature(request.get_data(), request.headers.get('X-Hub-Signature-256', '')):
+        return jsonify({'error': 'Assinatura inválida'}), 403
+    
+    event = request.headers.get('X-GitHub-Event', '')
+    if event == 'ping':
+        return jsonify({'success': True, 'pong': True})
+    
+    if event not in ('push', 'repository', 'star'):
+        return jsonify({'success': True, 'ignored': event}), 202
+    
+    try:
+        payload = request.get_json(silent=True) or {}
+        repo = payload.get('repository')
+        if not repo or 'id' not in repo:
+            return jsonify({'error': 'Evento sem repositório'}), 400
+        
+        action = payload.get('action')
+        removed = not webhook_repo_is_public(event, repo, action)
+        
+        merged, github_version, base_version = github_sync.apply_repo_update(normalize_webhook_repo(repo), removed=removed)
+        project = update_processed_project(merged, github_version, base_version, removed=removed)
+        get_project_view()
+        
+        print(f"🪝 Webhook {event}/{action or '-'}: {merged.get('name')} (versão {github_version})")
+        return jsonify({
+            'success': True,
+            'event': event,
+            'removed': removed,
+            'project': project,
+            'version': github_version
+        })
+        
+    except Exception as e:
+        print(f"❌ Erro no webhook: {e}")
+        print(f"❌ Stack: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/projects/custom', methods=['POST'])
 def api_create_custom_project():
     """Cria projeto customizado"""
@@ -676,14 +954,11 @@ def api_create_custom_project():
             'updated_at': datetime.now().isoformat()
         }
         
-        portfolio_data = load_project_data()
-        portfolio_data['custom_projects'].append(project)
+        _, version = project_store.add_custom_project(project)
+        project_data_changed()
         
-        if save_project_data(portfolio_data):
-            print(f"✅ Projeto customizado criado: {project['title']}")
-            return jsonify({'success': True, 'project': project})
-        else:
-            return jsonify({'error': 'Erro ao salvar projeto'}), 500
+        print(f"✅ Projeto customizado criado: {project['title']}")
+        return versioned_response({'success': True, 'project': project}, version)
             
     except Exception as e:
         print(f"❌ Erro criar projeto custom: {e}")
@@ -696,8 +971,6 @@ def api_update_github_project(github_id):
         return jsonify({'error': 'Não autorizado'}), 401
     
     try:
-        portfolio_data = load_project_data()
-        
         metadata = {
             'category': request.form.get('category'),
             'title': request.form.get('title'),
@@ -709,13 +982,14 @@ def api_update_github_project(github_id):
         
         metadata = {k: v for k, v in metadata.items() if v}
         
-        portfolio_data['github_metadata'][github_id] = metadata
+        # Uma linha no SQLite (ou um registro no log do backend JSON)
+        _, version = project_store.set_github_metadata(github_id, metadata, if_match_version())
+        project_data_changed()
         
-        if save_project_data(portfolio_data):
-            return jsonify({'success': True, 'metadata': metadata})
-        else:
-            return jsonify({'error': 'Erro ao salvar'}), 500
+        return versioned_response({'success': True, 'metadata': metadata}, version)
             
+    except VersionConflict as e:
+        return version_conflict_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -727,11 +1001,9 @@ def api_get_project_gallery(project_id):
         return jsonify({'error': 'Não autorizado'}), 401
     
     try:
-        portfolio_data = load_project_data()
-        galleries = portfolio_data.get('project_galleries', {})
-        gallery = get_project_gallery(project_id, galleries)
+        gallery, version = project_store.get_document('gallery', project_id)
         
-        return jsonify({'success': True, 'gallery': gallery})
+        return versioned_response({'success': True, 'gallery': gallery or empty_gallery()}, version)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -742,19 +1014,6 @@ def api_upload_project_images(project_id):
         return jsonify({'error': 'Não autorizado'}), 401
     
     try:
-        portfolio_data = load_project_data()
-        
-        if 'project_galleries' not in portfolio_data:
-            portfolio_data['project_galleries'] = {}
-        
-        if project_id not in portfolio_data['project_galleries']:
-            portfolio_data['project_galleries'][project_id] = {
-                'main_image': '',
-                'images': [],
-                'modules': {}
-            }
-        
-        gallery = portfolio_data['project_galleries'][project_id]
         module_name = request.form.get('module', 'geral')
         is_main = request.form.get('is_main') == 'true'
         
@@ -768,7 +1027,7 @@ def api_upload_project_images(project_id):
                     image_info = {
                         'id': uuid.uuid4().hex[:12],
                         'filename': processed_file['filename'],
-                        'data': processed_file['data'],
+                        'hash': processed_file['hash'],
                         'size': processed_file['size'],
                         'type': processed_file['type'],
                         'mime_type': processed_file['mime_type'],
@@ -777,26 +1036,22 @@ def api_upload_project_images(project_id):
                         'description': request.form.get(f'description_{file_key}', '')
                     }
                     
-                    gallery['images'].append(image_info)
-                    
-                    if module_name not in gallery['modules']:
-                        gallery['modules'][module_name] = []
-                    gallery['modules'][module_name].append(image_info)
-                    
-                    if is_main or not gallery['main_image']:
-                        gallery['main_image'] = processed_file['data']
-                    
                     uploaded_images.append(image_info)
         
-        if save_project_data(portfolio_data):
-            return jsonify({
-                'success': True, 
-                'uploaded_images': uploaded_images,
-                'total_images': len(gallery['images'])
-            })
-        else:
-            return jsonify({'error': 'Erro ao salvar imagens'}), 500
+        # Sem If-Match, uploads simultâneos na mesma galeria são refeitos até os dois entrarem
+        total_images, version = project_store.add_gallery_images(
+            project_id, uploaded_images, is_main, if_match_version()
+        )
+        project_data_changed()
+        
+        return versioned_response({
+            'success': True, 
+            'uploaded_images': uploaded_images,
+            'total_images': total_images
+        }, version)
             
+    except VersionConflict as e:
+        return version_conflict_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -807,27 +1062,15 @@ def api_delete_project_image(project_id, image_id):
         return jsonify({'error': 'Não autorizado'}), 401
     
     try:
-        portfolio_data = load_project_data()
-        galleries = portfolio_data.get('project_galleries', {})
-        
-        if project_id in galleries:
-            gallery = galleries[project_id]
-            
-            gallery['images'] = [img for img in gallery['images'] if img.get('id') != image_id]
-            
-            for module in gallery['modules']:
-                gallery['modules'][module] = [img for img in gallery['modules'][module] if img.get('id') != image_id]
-            
-            if gallery.get('main_image'):
-                main_exists = any(img for img in gallery['images'] if img.get('data') == gallery['main_image'])
-                if not main_exists:
-                    gallery['main_image'] = gallery['images'][0]['data'] if gallery['images'] else ''
-            
-            if save_project_data(portfolio_data):
-                return jsonify({'success': True})
+        deleted, version = project_store.delete_gallery_image(project_id, image_id, if_match_version())
+        if deleted:
+            project_data_changed()
+            return versioned_response({'success': True}, version)
         
         return jsonify({'error': 'Imagem não encontrada'}), 404
         
+    except VersionConflict as e:
+        return version_conflict_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -840,22 +1083,15 @@ def api_set_main_image(project_id):
     try:
         image_id = request.json.get('image_id')
         
-        portfolio_data = load_project_data()
-        galleries = portfolio_data.get('project_galleries', {})
-        
-        if project_id in galleries:
-            gallery = galleries[project_id]
-            
-            target_image = next((img for img in gallery['images'] if img.get('id') == image_id), None)
-            
-            if target_image:
-                gallery['main_image'] = target_image['data']
-                
-                if save_project_data(portfolio_data):
-                    return jsonify({'success': True})
+        updated, version = project_store.set_main_image(project_id, image_id, if_match_version())
+        if updated:
+            project_data_changed()
+            return versioned_response({'success': True}, version)
         
         return jsonify({'error': 'Imagem não encontrada'}), 404
         
+    except VersionConflict as e:
+        return version_conflict_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -866,20 +1102,44 @@ def api_delete_custom_project(project_id):
         return jsonify({'error': 'Não autorizado'}), 401
     
     try:
-        portfolio_data = load_project_data()
-        portfolio_data['custom_projects'] = [
-            p for p in portfolio_data['custom_projects'] 
-            if p['id'] != project_id
-        ]
-        
-        if project_id in portfolio_data.get('project_galleries', {}):
-            del portfolio_data['project_galleries'][project_id]
+        project_store.delete_custom_project(project_id, if_match_version())
+        project_data_changed()
         
-        if save_project_data(portfolio_data):
-            return jsonify({'success': True})
-        else:
-            return jsonify({'error': 'Erro ao deletar'}), 500
+        return jsonify({'success': True})
             
+    except VersionConflict as e:
+        return version_conflict_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/media/<digest>')
+def media(digest):
+    """Imagem da galeria pelo hash (conteúdo imutável, cache longo)"""
+    if not blob_store.exists(digest):
+        abort(404)
+    
+    response = send_file(
+        blob_store.path(digest),
+        mimetype=blob_store.mime_type(digest),
+        etag=digest,
+        conditional=True,
+        max_age=31536000
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/admin/media/gc', methods=['POST'])
+def collect_media_garbage():
+    """Remove imagens que nenhuma galeria usa mais"""
+    if 'admin_logged' not in session:
+        return jsonify({'error': 'Não autorizado'}), 401
+    
+    try:
+        removed, freed = blob_store.collect_garbage(
+            referenced_digests(project_store.export()),
+            GALLERY_BLOB_GC_GRACE
+        )
+        return jsonify({'success': True, 'removed': removed, 'freed_bytes': freed})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -890,8 +1150,7 @@ def backup_data():
         return redirect('/admin/login')
     
     try:
-        with open('portfolio_data.json', 'r', encoding='utf-8') as f:
-            data = f.read()
+        data = json.dumps(project_store.export(), ensure_ascii=False, indent=2, default=dict)
         
         return Response(
             data,
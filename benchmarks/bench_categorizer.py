@@ -0,0 +1,93 @@
+"""Benchmark da categorização automática de repositórios.
+
+Compara a categorização antiga (cinco `any(keyword in text)` com listas
+fixas) com o CategoryRules compilado, repositório a repositório e em lote,
+em dois conjuntos sintéticos: nomes curtos cheios de palavras-chave e
+descrições longas sem nenhuma (o pior caso, que vira 'outros').
+
+Uso:
+    python benchmarks/bench_categorizer.py --size 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorizer import AHOCORASICK_AVAILABLE, CategoryRules
+from fake_github import generate_repos
+
+FILLER_WORDS = (
+    'projeto de estudo para aprender python com testes unitarios e documentacao '
+    'completa sobre algoritmos estruturas de dados e boas praticas'
+).split()
+
+
+def legacy_categorize(repo_name, language, description):
+    """Versão original de auto_categorize_github_repo()"""
+    text = f"{repo_name} {description or ''}".lower()
+
+    rpa_keywords = ['rpa', 'bot', 'robot', 'automation', 'scraping', 'selenium', 'scraper',
+                    'spider', 'crawler', 'extractor', 'monitor', 'notificador', 'quickbook']
+    if any(keyword in text for keyword in rpa_keywords):
+        return 'rpa'
+
+    system_keywords = ['system', 'erp', 'sysrohden', 'app', 'dashboard', 'admin',
+                       'manager', 'platform', 'cms', 'crm', 'portal']
+    if any(keyword in text for keyword in system_keywords):
+        return 'sistema'
+
+    api_keywords = ['api', 'rest', 'endpoint', 'service', 'microservice', 'backend']
+    if any(keyword in text for keyword in api_keywords):
+        return 'api'
+
+    web_keywords = ['website', 'web', 'frontend', 'react', 'vue', 'angular', 'html', 'css']
+    if any(keyword in text for keyword in web_keywords):
+        return 'web'
+
+    mobile_keywords = ['mobile', 'android', 'ios', 'flutter', 'react-native']
+    if any(keyword in text for keyword in mobile_keywords):
+        return 'mobile'
+
+    return 'outros'
+
+
+def synthetic_sets(size):
+    rng = random.Random(7)
+    short = [(repo['name'], repo['description']) for repo in generate_repos(size)]
+    long = [
+        (f"repo-{i}", ' '.join(rng.choice(FILLER_WORDS) for _ in range(40)))
+        for i in range(size)
+    ]
+    return {'curtos com palavras-chave': short, 'longos sem palavras-chave': long}
+
+
+def best_ms(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark da categorização')
+    parser.add_argument('--size', type=int, default=10000)
+    args = parser.parse_args()
+
+    rules_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'category_rules.json')
+    rules = CategoryRules(rules_file)
+    print(f"🏷️ Motor: {'Aho-Corasick' if AHOCORASICK_AVAILABLE else 'substring (sem pyahocorasick)'}")
+
+    for label, items in synthetic_sets(args.size).items():
+        expected = [legacy_categorize(name, None, description) for name, description in items]
+        assert rules.categorize_many(items) == expected, 'categorias diferentes da versão antiga'
+
+        print(f"\n📦 {args.size} repositórios ({label})")
+        print(f"   - antigo:            {best_ms(lambda: [legacy_categorize(n, None, d) for n, d in items]):8.2f} ms")
+        print(f"   - compilado (1 a 1): {best_ms(lambda: [rules.categorize(n, d) for n, d in items]):8.2f} ms")
+        print(f"   - compilado (lote):  {best_ms(lambda: rules.categorize_many(items)):8.2f} ms")
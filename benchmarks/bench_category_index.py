@@ -0,0 +1,89 @@
+"""Benchmark dos índices ordenados por categoria.
+
+Compara, com N projetos, a ordenação completa de todas as categorias
+(como organize_all_projects() fazia a cada requisição) com o
+SortedProjectIndex, que move só o projeto alterado.
+
+Uso:
+    python benchmarks/bench_category_index.py --size 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import generate_repos
+from project_processing import build_github_project
+from project_view import CATEGORIES, SortedProjectIndex, project_sort_key
+
+
+def full_sort(categorized):
+    for category in categorized:
+        categorized[category].sort(key=lambda x: (not x.get('featured', False), x.get('updated_at', '')), reverse=True)
+
+
+def report(label, microseconds):
+    print(f"   - {label:<45} {microseconds:10.1f} µs")
+
+
+def best_us(fn, repeat=200):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1_000_000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark dos índices por categoria')
+    parser.add_argument('--size', type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    projects = [
+        build_github_project(repo, {'featured': rng.random() < 0.05}, {}, '')
+        for repo in generate_repos(args.size)
+    ]
+    categorized = {category: [p for p in projects if p['category'] == category] for category in CATEGORIES}
+    indexes = {category: SortedProjectIndex(items) for category, items in categorized.items()}
+    largest = max(CATEGORIES, key=lambda category: len(indexes[category]))
+
+    print(f"📦 {args.size} projetos ({', '.join(f'{c}={len(indexes[c])}' for c in CATEGORIES)})")
+    report('ordenação completa (todas as categorias)', best_us(lambda: full_sort(categorized), 20))
+
+    def toggle_featured():
+        project = rng.choice(indexes[largest])
+        updated = {**project, 'featured': not project['featured']}
+        indexes[largest].update([updated], [project])
+
+    def bump_updated_at():
+        project = rng.choice(indexes[largest])
+        updated = {**project, 'updated_at': f"2030-01-01T00:00:{rng.randint(0, 59):02d}Z"}
+        indexes[largest].update([updated], [project])
+
+    counter = [0]
+
+    def insert_custom():
+        counter[0] += 1
+        indexes[largest].add({
+            'id': f"custom_bench_{counter[0]}",
+            'category': largest,
+            'featured': False,
+            'updated_at': f"2029-01-01T00:00:{counter[0] % 60:02d}Z"
+        })
+
+    report(f'índice: alternar featured ({largest})', best_us(toggle_featured))
+    report('índice: webhook muda updated_at', best_us(bump_updated_at))
+    report('índice: novo projeto customizado', best_us(insert_custom))
+    report('índice: cópia (copy-on-write por refresh)', best_us(lambda: indexes[largest].copy()))
+
+    assert list(indexes[largest]) == sorted(indexes[largest], key=project_sort_key, reverse=True)
+
+    as_list = list(indexes[largest])
+    report('iterar lista', best_us(lambda: [p for p in as_list], 50))
+    report('iterar índice', best_us(lambda: [p for p in indexes[largest]], 50))
@@ -0,0 +1,60 @@
+"""Memória dos projetos processados: dicionários x ProjectRecord.
+
+Mede (tracemalloc) N projetos do GitHub decodificados do JSON do
+snapshot, como um worker os carrega do SnapshotStore, nos dois formatos.
+
+Uso:
+    python benchmarks/bench_project_memory.py --size 10000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import generate_repos
+from project_processing import PROJECT_COLORS, build_github_project
+from project_record import ProjectRecord
+
+
+def measure(build):
+    """Memória que continua alocada depois de `build()` (os temporários já foram liberados)"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Memória por projeto')
+    parser.add_argument('--size', type=int, default=10000)
+    args = parser.parse_args()
+
+    repos = generate_repos(args.size)
+    for repo in repos:
+        repo['languages'] = repo.pop('_languages')
+    projects = [
+        build_github_project(repo, {}, {}, PROJECT_COLORS[i % len(PROJECT_COLORS)])
+        for i, repo in enumerate(repos)
+    ]
+    payload = json.dumps([project.to_dict() for project in projects], ensure_ascii=False)
+
+    dicts, dicts_size = measure(lambda: json.loads(payload))
+    records, records_size = measure(lambda: [ProjectRecord.from_dict(project) for project in json.loads(payload)])
+
+    assert [record.to_dict() for record in records] == dicts
+
+    # Só os campos de nível superior (sem as listas/dicionários aninhados)
+    shallow_dict = sys.getsizeof(dicts[0])
+    shallow_record = sys.getsizeof(records[0])
+
+    print(f"📦 {args.size} projetos")
+    print(f"   - dicionários:    {dicts_size / 1024 / 1024:7.2f} MB ({dicts_size / args.size:6.0f} bytes/projeto)")
+    print(f"   - ProjectRecord:  {records_size / 1024 / 1024:7.2f} MB ({records_size / args.size:6.0f} bytes/projeto)")
+    print(f"   - objeto raiz:    dict {shallow_dict} bytes, ProjectRecord {shallow_record} bytes")
+    print(f"   - economia:       {(1 - records_size / dicts_size) * 100:5.1f}%")
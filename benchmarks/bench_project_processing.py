@@ -0,0 +1,108 @@
+"""Benchmark do processamento incremental dos projetos do GitHub.
+
+Compara o processamento completo (build_github_project() em todos os
+repositórios) com o ProjectMemo, que só reprocessa os repositórios cuja
+chave mudou.
+
+Uso:
+    python benchmarks/bench_project_processing.py --sizes 1000 10000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import generate_repos
+from project_processing import PROJECT_COLORS, ProjectMemo, build_github_project, get_project_gallery
+
+
+def full_rebuild(repos, github_metadata, galleries):
+    """Processamento antigo: todos os projetos montados do zero"""
+    return [
+        build_github_project(
+            repo,
+            github_metadata.get(str(repo['id']), {}),
+            get_project_gallery(f"github_{repo['id']}", galleries),
+            PROJECT_COLORS[i % len(PROJECT_COLORS)]
+        )
+        for i, repo in enumerate(repos)
+    ]
+
+
+def touch(repos, count, suffix):
+    """Cópia de `repos` com `count` repositórios atualizados"""
+    step = max(1, len(repos) // max(count, 1))
+    touched = set(range(0, len(repos), step)[:count])
+    return [
+        {**repo, 'updated_at': repo['updated_at'] + suffix} if i in touched else repo
+        for i, repo in enumerate(repos)
+    ]
+
+
+def cpu_ms(fn, repeat=5):
+    """Menor tempo de CPU (ms) entre `repeat` execuções"""
+    best = None
+    gc.collect()
+    for _ in range(repeat):
+        started = time.process_time()
+        fn()
+        elapsed = (time.process_time() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(size):
+    repos = generate_repos(size)
+    github_metadata = {
+        str(repo['id']): {'featured': True, 'tags': ['destaque']}
+        for repo in repos[::50]
+    }
+    galleries = {
+        f"github_{repo['id']}": {'main_image': '', 'images': [], 'modules': {}}
+        for repo in repos[::100]
+    }
+    stamp = [1, 1]
+
+    print(f"\n📦 {size} repositórios")
+    print(f"   - processamento completo:      {cpu_ms(lambda: full_rebuild(repos, github_metadata, galleries)):8.2f} ms")
+
+    memo = ProjectMemo()
+    started = time.process_time()
+    memo.process(repos, github_metadata, galleries, stamp)
+    print(f"   - memo (primeira vez):         {(time.process_time() - started) * 1000:8.2f} ms")
+
+    print(f"   - memo sem mudanças:           {cpu_ms(lambda: memo.process(repos, github_metadata, galleries, stamp)):8.2f} ms")
+
+    for changed in sorted({10, size // 100, size // 10}):
+        counter = [0]
+
+        def refresh():
+            counter[0] += 1
+            memo.process(touch(repos, changed, f"#{counter[0]}"), github_metadata, galleries, stamp)
+
+        # touch() em si é O(n); desconta o custo dele do tempo medido
+        touch_cost = cpu_ms(lambda: touch(repos, changed, '#x'))
+        print(f"   - memo com {changed:>5} alterados:    {cpu_ms(refresh) - touch_cost:8.2f} ms")
+
+    edited = dict(github_metadata)
+    edited[str(repos[0]['id'])] = {'featured': False, 'title': 'Editado'}
+    counter = [0]
+
+    def metadata_edit():
+        counter[0] += 1
+        memo.process(repos, edited, galleries, [2, counter[0]])
+
+    print(f"   - memo após editar metadados:  {cpu_ms(metadata_edit):8.2f} ms")
+    print(f"   - estatísticas: {memo.stats()}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark do processamento incremental')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size)
@@ -0,0 +1,256 @@
+"""Imagens das galerias em disco, endereçadas pelo conteúdo (SHA-256).
+
+Cada arquivo é gravado uma única vez em `<diretório>/<2 primeiros>/<hash>`;
+as galerias guardam só o hash, o tamanho e o mime type. Uploads idênticos
+viram o mesmo blob sem custo extra, e o app serve os blobs em
+/media/<hash> com cache imutável.
+
+Migração das imagens inline (data URIs) e coleta de blobs órfãos:
+    python blob_store.py migrate [portfolio_data.json] [gallery_blobs]
+    python blob_store.py gc [portfolio_data.json] [gallery_blobs]
+"""
+import argparse
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
+from collections.abc import Mapping
+
+MEDIA_URL = '/media'
+
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+_DATA_URI_RE = re.compile(r'^data:([^;,]+)?(;base64)?,', re.IGNORECASE)
+
+# Assinaturas dos formatos aceitos no upload (para servir com o Content-Type certo)
+_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+def is_digest(value):
+    return isinstance(value, str) and bool(_DIGEST_RE.match(value))
+
+
+def sniff_mime(head):
+    """Mime type pelos primeiros bytes do arquivo"""
+    for signature, mime_type in _SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'application/octet-stream'
+
+
+def decode_data_uri(uri):
+    """(bytes, mime type) de um data URI; None se não for um"""
+    match = _DATA_URI_RE.match(uri or '')
+    if not match:
+        return None
+    payload = uri[match.end():]
+    data = base64.b64decode(payload) if match.group(2) else payload.encode('utf-8')
+    return data, match.group(1) or 'application/octet-stream'
+
+
+def image_src(value):
+    """URL para <img src>: aceita uma imagem da galeria ou o main_image.
+
+    Hashes viram /media/<hash>; data URIs antigos e URLs externas passam
+    direto.
+    """
+    if isinstance(value, Mapping):
+        value = value.get('hash') or value.get('data', '')
+    if is_digest(value):
+        return f"{MEDIA_URL}/{value}"
+    return value or ''
+
+
+def image_ref(image):
+    """O que o main_image guarda para esta imagem (hash ou data URI antigo)"""
+    return image.get('hash') or image.get('data', '')
+
+
+class BlobStore:
+    """Diretório de blobs endereçados por SHA-256"""
+
+    def __init__(self, directory='gallery_blobs'):
+        # Caminho absoluto: o send_file do Flask resolve caminhos relativos pelo app.root_path
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, digest):
+        if not is_digest(digest):
+            raise ValueError(f"hash inválido: {digest!r}")
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def exists(self, digest):
+        return is_digest(digest) and os.path.exists(self.path(digest))
+
+    def put(self, data):
+        """Grava os bytes (se ainda não existem) e retorna o hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            # Renova o mtime: o blob volta a ser "novo" para a carência do GC
+            # até a galeria que vai referenciá-lo ser gravada
+            try:
+                os.utime(path)
+                return digest
+            except FileNotFoundError:
+                # O GC removeu o blob agora mesmo; grava de novo
+                pass
+
+        # Grava num temporário e renomeia: leitores nunca veem um blob pela metade
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest):
+        with open(self.path(digest), 'rb') as f:
+            return f.read()
+
+    def mime_type(self, digest):
+        with open(self.path(digest), 'rb') as f:
+            return sniff_mime(f.read(16))
+
+    def __iter__(self):
+        for prefix in os.listdir(self.directory):
+            folder = os.path.join(self.directory, prefix)
+            if len(prefix) != 2 or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if is_digest(name):
+                    yield name
+
+    def collect_garbage(self, referenced, grace_seconds=3600):
+        """Remove blobs que nenhuma galeria referencia.
+
+        Blobs mais novos que `grace_seconds` ficam (um upload grava o blob
+        antes de registrá-lo na galeria). Retorna (removidos, bytes liberados).
+        """
+        cutoff = time.time() - grace_seconds
+        removed = freed = 0
+        for digest in list(self):
+            if digest in referenced:
+                continue
+            path = self.path(digest)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                os.unlink(path)
+            except OSError:
+                continue
+            removed += 1
+            freed += stat.st_size
+        print(f"🧹 Blobs removidos: {removed} ({freed} bytes)")
+        return removed, freed
+
+
+def referenced_digests(data):
+    """Hashes usados pelas galerias (imagens e imagens principais)"""
+    digests = set()
+    for gallery in data.get('project_galleries', {}).values():
+        if is_digest(gallery.get('main_image')):
+            digests.add(gallery['main_image'])
+        for image in gallery.get('images', []):
+            if is_digest(image.get('hash')):
+                digests.add(image['hash'])
+    return digests
+
+
+def extract_inline_images(data, blobs):
+    """Move os data URIs das galerias para o BlobStore (altera `data`).
+
+    Retorna quantas imagens foram extraídas.
+    """
+    extracted = 0
+    for gallery in data.get('project_galleries', {}).values():
+        converted = {}
+        for image in gallery.get('images', []):
+            decoded = decode_data_uri(image.get('data'))
+            if decoded is None:
+                continue
+            content, mime_type = decoded
+            digest = blobs.put(content)
+            converted[image['data']] = digest
+            del image['data']
+            image.update(hash=digest, size=len(content), mime_type=image.get('mime_type') or mime_type)
+            extracted += 1
+
+        # As listas por módulo têm cópias das mesmas imagens
+        by_id = {image.get('id'): image for image in gallery.get('images', [])}
+        for images in gallery.get('modules', {}).values():
+            for i, image in enumerate(images):
+                if image.get('data') in converted and image.get('id') in by_id:
+                    images[i] = dict(by_id[image['id']])
+
+        main_image = gallery.get('main_image')
+        if main_image in converted:
+            gallery['main_image'] = converted[main_image]
+        elif decode_data_uri(main_image) is not None:
+            gallery['main_image'] = blobs.put(decode_data_uri(main_image)[0])
+    return extracted
+
+
+def has_inline_images(data):
+    return any(
+        decode_data_uri(image.get('data')) is not None
+        for gallery in data.get('project_galleries', {}).values()
+        for image in gallery.get('images', [])
+    )
+
+
+def migrate_inline_images(store, blobs):
+    """Migração única: tira as imagens inline dos dados do portfólio"""
+    data = store.export()
+    if not has_inline_images(data):
+        return 0
+
+    data = {**data, 'project_galleries': {
+        project_id: {
+            'main_image': gallery.get('main_image', ''),
+            'images': [dict(image) for image in gallery.get('images', [])],
+            'modules': {module: [dict(image) for image in images] for module, images in gallery.get('modules', {}).items()}
+        }
+        for project_id, gallery in data.get('project_galleries', {}).items()
+    }}
+    extracted = extract_inline_images(data, blobs)
+    store.replace_galleries(data['project_galleries'])
+    print(f"🖼️ {extracted} imagens movidas para {blobs.directory}/")
+    return extracted
+
+
+if __name__ == '__main__':
+    from project_store import JsonProjectStore, SqliteProjectStore
+
+    parser = argparse.ArgumentParser(description='Blobs das imagens das galerias')
+    parser.add_argument('command', choices=['migrate', 'gc'])
+    parser.add_argument('data_path', nargs='?', default='portfolio_data.json',
+                        help='portfolio_data.json ou o banco SQLite (.db)')
+    parser.add_argument('blob_dir', nargs='?', default='gallery_blobs')
+    parser.add_argument('--grace', type=int, default=3600, help='idade mínima (s) de um blob órfão para ser removido')
+    args = parser.parse_args()
+
+    if args.data_path.endswith('.db'):
+        store = SqliteProjectStore(args.data_path)
+    else:
+        store = JsonProjectStore(args.data_path)
+    blobs = BlobStore(args.blob_dir)
+
+    if args.command == 'migrate':
+        migrate_inline_images(store, blobs)
+    else:
+        blobs.collect_garbage(referenced_digests(store.export()), args.grace)
@@ -0,0 +1,56 @@
+import functools
+import threading
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Enquanto a primeira chamada está em andamento, as demais esperam e
+    recebem o mesmo resultado (ou a mesma exceção).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'executions': 0, 'shared': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            is_owner = call is None
+            if is_owner:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self._stats['executions'] += 1
+            else:
+                self._stats['shared'] += 1
+
+        if not is_owner:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn(*args, **kwargs)
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['event'].set()
+
+    def wrap(self, key):
+        """Decorador: `@flight.wrap('chave')`"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                return self.do(key, fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'in_flight': sorted(str(k) for k in self._calls)}
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    print("⚠️ pyahocorasick não disponível - categorização usa busca por substring")
+
+# Regras padrão (usadas quando o arquivo de regras não existe).
+# A ordem define a prioridade: a primeira categoria com palavra-chave no texto vence.
+DEFAULT_RULES = [
+    {'category': 'rpa', 'keywords': ['rpa', 'bot', 'robot', 'automation', 'scraping', 'selenium', 'scraper',
+                                     'spider', 'crawler', 'extractor', 'monitor', 'notificador', 'quickbook']},
+    {'category': 'sistema', 'keywords': ['system', 'erp', 'sysrohden', 'app', 'dashboard', 'admin',
+                                         'manager', 'platform', 'cms', 'crm', 'portal']},
+    {'category': 'api', 'keywords': ['api', 'rest', 'endpoint', 'service', 'microservice', 'backend']},
+    {'category': 'web', 'keywords': ['website', 'web', 'frontend', 'react', 'vue', 'angular', 'html', 'css']},
+    {'category': 'mobile', 'keywords': ['mobile', 'android', 'ios', 'flutter', 'react-native']}
+]
+DEFAULT_CATEGORY = 'outros'
+
+
+class CategoryRules:
+    """Categorização automática de repositórios por palavras-chave.
+
+    As regras vêm de um arquivo JSON ({"default": ..., "rules": [{"category",
+    "keywords"}, ...]}) e são compiladas uma vez: com pyahocorasick, todas as
+    palavras de todas as categorias viram um único autômato Aho-Corasick
+    (uma passada pelo texto); sem ele, cada categoria vira uma tupla de
+    palavras já sem redundâncias (ex.: 'website' sai porque 'web' já
+    casa). O arquivo é relido sozinho quando o mtime muda, sem redeploy.
+    """
+
+    def __init__(self, path=None, check_interval=2):
+        self.path = path
+        self.check_interval = check_interval
+        self.default = DEFAULT_CATEGORY
+        self.categories = []
+        self.version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._compile(DEFAULT_RULES, DEFAULT_CATEGORY)
+        self.reload_if_changed(force=True)
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return [stat.st_mtime_ns, stat.st_size]
+        except (OSError, TypeError):
+            return None
+
+    def reload_if_changed(self, force=False):
+        """Relê o arquivo se ele mudou (checa no máximo a cada `check_interval`s)"""
+        now = time.time()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        stamp = self._stamp()
+        if stamp == self.version:
+            return False
+
+        with self._lock:
+            if stamp is None:
+                self._compile(DEFAULT_RULES, DEFAULT_CATEGORY)
+                self.version = None
+                return True
+
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                self._compile(config['rules'], config.get('default', DEFAULT_CATEGORY))
+            except Exception as e:
+                # Arquivo inválido: mantém as regras atuais
+                print(f"🏷️ Erro ao carregar regras de categoria de {self.path}: {e}")
+                self.version = stamp
+                return False
+
+            self.version = stamp
+            print(f"🏷️ Regras de categoria carregadas: {len(self.categories)} categorias de {self.path}")
+            return True
+
+    def _compile(self, rules, default):
+        categories = []
+        keywords = []
+        seen = []
+
+        for priority, rule in enumerate(rules):
+            category_keywords = [keyword.lower() for keyword in rule['keywords'] if keyword]
+            # Palavra que contém outra de prioridade igual ou maior nunca decide nada
+            kept = tuple(
+                keyword for keyword in dict.fromkeys(category_keywords)
+                if not any(other in keyword for other in seen)
+                and not any(other != keyword and other in keyword for other in category_keywords)
+            )
+            seen.extend(kept)
+            categories.append(rule['category'])
+            keywords.append(kept)
+
+        automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for priority, kept in enumerate(keywords):
+                for keyword in kept:
+                    automaton.add_word(keyword, priority)
+            if len(automaton):
+                automaton.make_automaton()
+            else:
+                automaton = None
+
+        # Troca tudo de uma vez (leituras concorrentes veem regras antigas ou novas)
+        self._compiled = (tuple(categories), tuple(keywords), automaton, default)
+        self.categories = categories
+        self.default = default
+
+    def categorize_text(self, text):
+        """Categoria de um texto já em minúsculas"""
+        categories, keywords, automaton, default = self._compiled
+
+        if automaton is not None:
+            best = None
+            for _, priority in automaton.iter(text):
+                if priority == 0:
+                    return categories[0]
+                if best is None or priority < best:
+                    best = priority
+            return categories[best] if best is not None else default
+
+        for category, kept in zip(categories, keywords):
+            if any(map(text.__contains__, kept)):
+                return category
+        return default
+
+    def categorize(self, name, description=None):
+        self.reload_if_changed()
+        return self.categorize_text(f"{name} {description or ''}".lower())
+
+    def categorize_many(self, items):
+        """Categoriza vários (nome, descrição) de uma vez; retorna a lista de categorias"""
+        self.reload_if_changed()
+        categorize_text = self.categorize_text
+        return [categorize_text(f"{name} {description or ''}".lower()) for name, description in items]
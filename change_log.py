@@ -0,0 +1,117 @@
+"""Log de alterações só de acréscimo (JSON lines) e gravação atômica de snapshots.
+
+Cada alteração é uma linha gravada com fsync, então uma edição pequena
+custa o tamanho do registro e sobrevive a uma queda do processo. Uma
+linha incompleta no fim do arquivo (queda no meio da escrita) é ignorada
+na leitura e descartada antes do próximo acréscimo.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sem trava entre processos (só a trava entre threads)
+    fcntl = None
+
+
+def write_atomic(path, data):
+    """Grava `data` (JSON) num temporário e troca com os.replace.
+
+    Leitores veem o arquivo antigo ou o novo inteiro, nunca pela metade.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Garante que a troca de nome também está no disco
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class ChangeLog:
+    """Arquivo de registros JSON, um por linha, só com acréscimos"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def stat(self):
+        """(inode, tamanho) do log; None se ainda não existe"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size)
+
+    @contextmanager
+    def locked(self):
+        """Trava exclusiva entre threads e entre processos (workers)"""
+        with self._lock:
+            with open(self.path, 'a+b') as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def read_from(self, offset=0):
+        """Registros completos a partir de `offset`.
+
+        Retorna (registros, novo offset, bytes lidos); o offset para no fim
+        da última linha completa.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                raw = f.read()
+        except FileNotFoundError:
+            return [], 0, 0
+
+        end = raw.rfind(b'\n') + 1
+        records = []
+        for line in raw[:end].splitlines():
+            if line.strip():
+                records.append(json.loads(line))
+        return records, offset + end, end
+
+    def append(self, record, offset):
+        """Acrescenta um registro (com fsync); retorna o novo tamanho.
+
+        `offset` é o fim da última linha completa já lida: qualquer coisa
+        depois dele é uma linha cortada por uma queda e é descartada. Deve
+        ser chamado dentro de `locked()`.
+        """
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        with open(self.path, 'r+b' if os.path.exists(self.path) else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset + len(line)
+
+    def reset(self):
+        """Esvazia o log (depois de compactado num snapshot)"""
+        with open(self.path, 'r+b' if os.path.exists(self.path) else 'wb') as f:
+            f.truncate(0)
+            f.flush()
+            os.fsync(f.fileno())
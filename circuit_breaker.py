@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Chamada recusada porque o circuito está aberto"""
+
+    def __init__(self, name, retry_at):
+        self.name = name
+        self.retry_at = retry_at
+        super().__init__(f"Circuito '{name}' aberto, nova tentativa em {max(0, retry_at - time.time()):.0f}s")
+
+
+class CircuitBreaker:
+    """Circuit breaker por taxa de erro e latência.
+
+    Guarda o resultado das últimas `window` chamadas. Abre quando, com pelo
+    menos `min_calls` chamadas, a fração de erros ou de chamadas lentas
+    (acima de `slow_call_seconds`) passa dos limites. Aberto, recusa tudo
+    por `reset_timeout` segundos; depois deixa passar `half_open_calls`
+    chamadas de teste, que fecham ou reabrem o circuito.
+
+    Toda chamada liberada por `before_call()` termina em `record_success()`,
+    `record_failure()` ou `release()` (chamada que nem chegou a acontecer).
+    Uma vaga de teste sem resultado depois de `half_open_timeout` segundos
+    é liberada mesmo assim, para o circuito nunca ficar preso meio aberto.
+    """
+
+    def __init__(self, name='circuit', window=20, min_calls=5, error_rate=0.5,
+                 slow_call_seconds=5.0, slow_call_rate=0.5, reset_timeout=60, half_open_calls=1,
+                 half_open_timeout=30):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.half_open_timeout = half_open_timeout
+
+        self._calls = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0
+        # Horário em que cada chamada de teste em andamento foi liberada
+        self._half_open_started = []
+        self._transitions = deque(maxlen=20)
+        self._counters = {'successes': 0, 'failures': 0, 'slow_calls': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            self._check_reset_timeout()
+            return self._state
+
+    def before_call(self):
+        """Levanta CircuitOpenError se a chamada não deve ser feita"""
+        with self._lock:
+            self._check_reset_timeout()
+
+            if self._state == OPEN:
+                self._counters['rejected'] += 1
+                raise CircuitOpenError(self.name, self._opened_at + self.reset_timeout)
+
+            if self._state == HALF_OPEN:
+                now = time.time()
+                self._half_open_started = [
+                    started for started in self._half_open_started
+                    if now - started < self.half_open_timeout
+                ]
+                if len(self._half_open_started) >= self.half_open_calls:
+                    self._counters['rejected'] += 1
+                    raise CircuitOpenError(self.name, now + 1)
+                self._half_open_started.append(now)
+
+    def release(self):
+        """Devolve a vaga de uma chamada liberada que não chegou a ter resultado"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_started:
+                self._half_open_started.pop(0)
+
+    def record_success(self, latency):
+        self._record(True, latency)
+
+    def record_failure(self, latency):
+        self._record(False, latency)
+
+    def _record(self, ok, latency):
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            self._counters['successes' if ok else 'failures'] += 1
+            if slow:
+                self._counters['slow_calls'] += 1
+
+            if self._state == HALF_OPEN:
+                if self._half_open_started:
+                    self._half_open_started.pop(0)
+                if ok and not slow:
+                    self._calls.clear()
+                    self._transition(CLOSED, 'chamada de teste OK')
+                else:
+                    self._transition(OPEN, 'chamada de teste falhou' if not ok else f'chamada de teste lenta ({latency:.1f}s)')
+                return
+
+            self._calls.append((ok, slow))
+            if self._state == CLOSED and len(self._calls) >= self.min_calls:
+                total = len(self._calls)
+                failures = sum(1 for call_ok, _ in self._calls if not call_ok)
+                slow_calls = sum(1 for _, call_slow in self._calls if call_slow)
+                if failures / total >= self.error_rate:
+                    self._transition(OPEN, f'taxa de erro {failures}/{total}')
+                elif slow_calls / total >= self.slow_call_rate:
+                    self._transition(OPEN, f'chamadas lentas {slow_calls}/{total}')
+
+    def _check_reset_timeout(self):
+        # Chamado com self._lock adquirido
+        if self._state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            self._half_open_started = []
+            self._transition(HALF_OPEN, 'tempo de espera encerrado')
+
+    def _transition(self, new_state, reason):
+        # Chamado com self._lock adquirido
+        if new_state == self._state:
+            return
+
+        self._transitions.append({
+            'from': self._state,
+            'to': new_state,
+            'reason': reason,
+            'at': time.time()
+        })
+        print(f"⚡ Circuito '{self.name}': {self._state} → {new_state} ({reason})")
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.time()
+
+    def metrics(self):
+        """Estado, contadores e últimas transições"""
+        with self._lock:
+            self._check_reset_timeout()
+            total = len(self._calls)
+            return {
+                'name': self.name,
+                'state': self._state,
+                'window_calls': total,
+                'window_error_rate': round(sum(1 for ok, _ in self._calls if not ok) / total, 3) if total else 0,
+                'retry_in': max(0, round(self._opened_at + self.reset_timeout - time.time())) if self._state == OPEN else 0,
+                **self._counters,
+                'transitions': list(self._transitions)
+            }
@@ -0,0 +1,306 @@
+"""Servidor falso da API do GitHub para testes e benchmarks locais.
+
+Responde REST (/users/{login}, /users/{login}/repos com paginação, Link e
+ETag/304, /repos/{login}/{repo}/languages) e GraphQL, com latência, erros
+e cota de rate limit configuráveis.
+
+Uso:
+    python fake_github.py --repos 10000 --latency 0.2 --error-rate 0.05 --port 8765
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=fake python app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NAME_WORDS = [
+    'erp', 'bot', 'api', 'dashboard', 'scraper', 'portal', 'web', 'mobile', 'crm',
+    'automation', 'service', 'react', 'flutter', 'monitor', 'toolkit', 'data', 'sync'
+]
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Java', 'C#', 'HTML', 'CSS', 'PHP', 'Dart']
+
+
+def generate_repos(count, username='rudirimachado', seed=42):
+    """Repositórios determinísticos, do mais recente para o mais antigo"""
+    rng = random.Random(seed)
+    now = datetime(2024, 6, 1)
+    repos = []
+
+    for i in range(count):
+        words = rng.sample(NAME_WORDS, 2)
+        language = rng.choice(LANGUAGES)
+        updated = now - timedelta(hours=i * 7)
+        created = updated - timedelta(days=rng.randint(10, 900))
+        repo_id = 100000 + i
+
+        languages = {language: rng.randint(5000, 500000)}
+        for extra in rng.sample(LANGUAGES, rng.randint(0, 3)):
+            languages.setdefault(extra, rng.randint(100, 50000))
+
+        repos.append({
+            'id': repo_id,
+            'name': f"{words[0]}-{words[1]}-{i}",
+            'description': f"Projeto {words[0]} {words[1]} número {i}",
+            'html_url': f"https://github.com/{username}/{words[0]}-{words[1]}-{i}",
+            'homepage': '',
+            'language': language,
+            'created_at': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updated_at': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'pushed_at': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'stargazers_count': rng.randint(0, 50),
+            'forks_count': rng.randint(0, 10),
+            'size': rng.randint(10, 20000),
+            'topics': rng.sample(NAME_WORDS, 2),
+            '_languages': languages
+        })
+
+    return repos
+
+
+class FakeGitHub:
+    """Estado do servidor falso (usuário e repositórios gerados)"""
+
+    def __init__(self, repo_count=50, username='rudirimachado', seed=42,
+                 latency=0.0, latency_jitter=0.0, error_rate=0.0, rate_limit=5000):
+        self.username = username
+        self.repos = generate_repos(repo_count, username, seed)
+        self.repos_by_name = {repo['name']: repo for repo in self.repos}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.requests = 0
+        self.server = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def begin_request(self):
+        """Conta a requisição, aplica latência e decide se injeta erro.
+
+        Retorna (erro injetado?, cota restante).
+        """
+        with self._lock:
+            self.requests += 1
+            self.remaining = max(0, self.remaining - 1)
+            remaining = self.remaining
+            delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+            fail = self._rng.random() < self.error_rate
+
+        if delay:
+            time.sleep(delay)
+        return fail, remaining
+
+    def rate_limit_headers(self, remaining, resource='core'):
+        return {
+            'X-RateLimit-Resource': resource,
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(int(time.time()) + 3600)
+        }
+
+    def rest_repo(self, repo, base_url):
+        """Repositório no formato REST (sem os campos internos)"""
+        data = {key: value for key, value in repo.items() if not key.startswith('_')}
+        data['languages_url'] = f"{base_url}/repos/{self.username}/{repo['name']}/languages"
+        return data
+
+    def user(self):
+        return {
+            'login': self.username,
+            'name': 'Rudieri Machado',
+            'bio': 'Desenvolvedor Full Stack & Especialista RPA',
+            'location': 'Blumenau, SC',
+            'avatar_url': '',
+            'html_url': f"https://github.com/{self.username}",
+            'public_repos': len(self.repos)
+        }
+
+    def graphql(self, variables):
+        """Responde a consulta de repositórios de github_graphql.REPOSITORIES_QUERY"""
+        first = int(variables.get('first') or 100)
+        offset = int(variables.get('after') or 0)
+        page = self.repos[offset:offset + first]
+        end = offset + len(page)
+        user = self.user()
+
+        return {
+            'data': {
+                'user': {
+                    'login': user['login'],
+                    'name': user['name'],
+                    'bio': user['bio'],
+                    'location': user['location'],
+                    'avatarUrl': user['avatar_url'],
+                    'url': user['html_url'],
+                    'repositories': {
+                        'totalCount': len(self.repos),
+                        'pageInfo': {'hasNextPage': end < len(self.repos), 'endCursor': str(end)},
+                        'nodes': [graphql_node(repo) for repo in page]
+                    }
+                },
+                'rateLimit': {'cost': 1, 'remaining': 4999, 'resetAt': '2030-01-01T00:00:00Z'}
+            }
+        }
+
+    def start(self, host='127.0.0.1', port=0):
+        """Sobe o servidor em uma thread; retorna a URL base"""
+        fake = self
+
+        class Handler(FakeGitHubHandler):
+            state = fake
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
+
+def graphql_node(repo):
+    return {
+        'databaseId': repo['id'],
+        'name': repo['name'],
+        'description': repo['description'],
+        'url': repo['html_url'],
+        'homepageUrl': repo['homepage'],
+        'createdAt': repo['created_at'],
+        'updatedAt': repo['updated_at'],
+        'pushedAt': repo['pushed_at'],
+        'stargazerCount': repo['stargazers_count'],
+        'forkCount': repo['forks_count'],
+        'diskUsage': repo['size'],
+        'primaryLanguage': {'name': repo['language']},
+        'languages': {
+            'edges': [{'size': size, 'node': {'name': name}} for name, size in repo['_languages'].items()]
+        },
+        'repositoryTopics': {'nodes': [{'topic': {'name': topic}} for topic in repo['topics']]},
+        'latestRelease': None
+    }
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_cacheable(self, body, headers):
+        """200 com ETag, ou 304 se o cliente já tem a mesma versão"""
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_json(200, body, {**headers, 'ETag': etag})
+
+    def check_failures(self, resource='core'):
+        """Latência/erros injetados; retorna headers de rate limit ou None se já respondeu"""
+        fail, remaining = self.state.begin_request()
+        headers = self.state.rate_limit_headers(remaining, resource)
+
+        if fail:
+            self.send_json(502, {'message': 'Server Error (injetado)'}, headers)
+            return None
+        if remaining <= 0:
+            self.send_json(403, {'message': 'API rate limit exceeded'}, headers)
+            return None
+        return headers
+
+    def do_GET(self):
+        headers = self.check_failures()
+        if headers is None:
+            return
+
+        state = self.state
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        base_url = f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+        if parts == ['users', state.username]:
+            self.send_cacheable(state.user(), headers)
+            return
+
+        if parts == ['users', state.username, 'repos']:
+            per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+            page = max(int(query.get('page', ['1'])[0]), 1)
+            last_page = max(1, -(-len(state.repos) // per_page))
+            items = state.repos[(page - 1) * per_page:page * per_page]
+
+            link = f'<{base_url}{url.path}?per_page={per_page}&page={last_page}>; rel="last"'
+            if page < last_page:
+                link = f'<{base_url}{url.path}?per_page={per_page}&page={page + 1}>; rel="next", ' + link
+
+            self.send_cacheable([state.rest_repo(repo, base_url) for repo in items], {**headers, 'Link': link})
+            return
+
+        if len(parts) == 4 and parts[0] == 'repos' and parts[3] == 'languages':
+            repo = state.repos_by_name.get(parts[2])
+            if repo:
+                self.send_cacheable(repo['_languages'], headers)
+                return
+
+        self.send_json(404, {'message': 'Not Found'}, headers)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        headers = self.check_failures('graphql')
+        if headers is None:
+            return
+
+        if self.path.rstrip('/') == '/graphql':
+            self.send_json(200, self.state.graphql(body.get('variables') or {}), headers)
+            return
+
+        self.send_json(404, {'message': 'Not Found'}, headers)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor falso da API do GitHub')
+    parser.add_argument('--repos', type=int, default=50)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--username', default='rudirimachado')
+    parser.add_argument('--latency', type=float, default=0.0, help='segundos por requisição')
+    parser.add_argument('--jitter', type=float, default=0.0, help='latência extra aleatória (segundos)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 502')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='cota total de requisições')
+    args = parser.parse_args()
+
+    fake = FakeGitHub(
+        repo_count=args.repos,
+        username=args.username,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit
+    )
+    url = fake.start(port=args.port)
+    print(f"🧪 GitHub falso em {url} com {args.repos} repositórios, "
+          f"latência {args.latency}s, erros {args.error_rate:.0%} (Ctrl+C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+from github_client import last_page_number, merge_pages
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    print("⚠️ httpx não disponível - busca assíncrona do GitHub desativada")
+
+
+class AsyncGitHubFetcher:
+    """Busca no GitHub com asyncio: chamadas independentes rodam juntas.
+
+    Usuário, páginas de repositórios e extras por repositório (ex.:
+    `languages_url`) são buscados em paralelo, limitados por um semáforo.
+    Reaproveita os validadores, o governor de rate limit e o circuit
+    breaker do GitHubClient, então o comportamento é o mesmo da versão
+    síncrona - só o tempo total passa a ser o da chamada mais lenta.
+    """
+
+    def __init__(self, client, concurrency=8):
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx não está instalado")
+        self.client = client
+        self.concurrency = concurrency
+
+    def fetch_user_and_repos(self, username, repo_extras=()):
+        """Wrapper síncrono (para a thread de sincronização / Flask)"""
+        return asyncio.run(self._fetch_user_and_repos(username, repo_extras))
+
+    def get_many_json(self, urls):
+        """Busca várias URLs em paralelo; retorna {url: dados} só das que deram certo"""
+        return asyncio.run(self._get_many_json(urls))
+
+    async def _get_many_json(self, urls):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._http() as http:
+            async def fetch(url):
+                try:
+                    async with semaphore:
+                        response = await self._get(http, self.client.url(url), None, {})
+                    return url, response.json() if response.status_code == 200 else None
+                except Exception as e:
+                    print(f"❌ Erro ao buscar {url}: {e}")
+                    return url, None
+
+            results = await asyncio.gather(*[fetch(url) for url in urls])
+
+        return {url: data for url, data in results if data is not None}
+
+    def _http(self):
+        connect_timeout, read_timeout = self.client.timeout
+        return httpx.AsyncClient(
+            headers=self.client.headers(),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+
+    async def _fetch_user_and_repos(self, username, repo_extras):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._http() as http:
+            started = time.time()
+            repos_params = {'sort': 'updated', 'per_page': 100}
+
+            (user_response, user_data), (repos_response, first_page) = await asyncio.gather(
+                self._get_json(http, semaphore, f'/users/{username}'),
+                self._get_json(http, semaphore, f'/users/{username}/repos', {**repos_params, 'page': 1})
+            )
+
+            if user_data is None:
+                print(f"❌ Erro User: {user_response.status_code} - {user_response.text}")
+                user_data = {}
+
+            if first_page is None:
+                print(f"❌ Erro Repos: {repos_response.status_code} - {repos_response.text}")
+                repos_response.raise_for_status()
+                raise httpx.HTTPStatusError(
+                    f"Repositórios retornaram {repos_response.status_code}",
+                    request=repos_response.request,
+                    response=repos_response
+                )
+
+            last_page = last_page_number(repos_response)
+            pages = [first_page]
+            if last_page > 1:
+                print(f"📚 Paginação assíncrona: {last_page} páginas")
+                results = await asyncio.gather(*[
+                    self._get_json(http, semaphore, f'/users/{username}/repos', {**repos_params, 'page': page})
+                    for page in range(2, last_page + 1)
+                ])
+                for page, (response, data) in enumerate(results, start=2):
+                    if data is None:
+                        response.raise_for_status()
+                        raise httpx.HTTPStatusError(
+                            f"Página {page} retornou {response.status_code}",
+                            request=response.request,
+                            response=response
+                        )
+                    pages.append(data)
+
+            repos_data = merge_pages(pages)
+
+            if repo_extras and repos_data:
+                # Cópias: os corpos originais ficam guardados junto com os validadores
+                repos_data = [dict(repo) for repo in repos_data]
+                await asyncio.gather(*[
+                    self._fetch_extras(http, semaphore, repo, repo_extras)
+                    for repo in repos_data
+                ])
+
+            print(f"⚡ Busca assíncrona: {len(repos_data)} repos em {time.time() - started:.2f}s")
+            return user_data, repos_data
+
+    async def _fetch_extras(self, http, semaphore, repo, repo_extras):
+        extras = {}
+        for field in repo_extras:
+            url = repo.get(field)
+            if not url:
+                continue
+            response, data = await self._get_json(http, semaphore, url)
+            if data is not None:
+                extras[field] = data
+        repo['extras'] = extras
+
+    async def _get_json(self, http, semaphore, path, params=None):
+        """GET condicional assíncrono; retorna (response, dados)"""
+        url = self.client.url(path)
+        key, cached, headers = self.client.conditional_headers(url, params)
+        async with semaphore:
+            response = await self._get(http, url, params, headers)
+        return self.client.resolve_conditional(key, url, cached, response)
+
+    async def _get(self, http, url, params, headers):
+        """Mesma política de retries/backoff do GitHubClient.get()"""
+        client = self.client
+        if client.fixtures and client.fixtures.replaying:
+            response = client.fixtures.replay('GET', url, params, None, {**client.headers(), **headers})
+            client.governor.update(response)
+            return response
+
+        attempt = 0
+        while True:
+            # O governor pode recusar ou atrasar a chamada: espera antes de ocupar vaga no circuito
+            delay = client.governor.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+
+            client.breaker.before_call()
+            started = time.time()
+            try:
+                response = await http.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                client.breaker.record_failure(time.time() - started)
+                if attempt >= client.max_retries:
+                    raise
+                delay = client.backoff(attempt)
+                print(f"🔁 Falha de rede em {url} ({e.__class__.__name__}), nova tentativa em {delay:.2f}s")
+            except httpx.HTTPError:
+                # DecodingError e afins: falhou, mas não vale nova tentativa
+                client.breaker.record_failure(time.time() - started)
+                raise
+            except BaseException:
+                # Cancelamento etc.: a chamada não chegou a um resultado, devolve a vaga
+                client.breaker.release()
+                raise
+            else:
+                if response.status_code >= 500:
+                    client.breaker.record_failure(time.time() - started)
+                else:
+                    client.breaker.record_success(time.time() - started)
+                client.governor.update(response)
+
+                delay = client.retry_delay(response, attempt)
+                if delay is None:
+                    if client.fixtures and client.fixtures.recording:
+                        client.fixtures.record('GET', url, params, None, response.status_code,
+                                               response.headers, response.text)
+                    return response
+                print(f"🔁 {url} retornou {response.status_code}, nova tentativa em {delay:.2f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,467 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import CircuitBreaker
+
+GITHUB_API_URL = 'https://api.github.com'
+
+# Status que valem nova tentativa (erros transitórios do servidor)
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class ValidatorStore:
+    """Guarda ETag / Last-Modified e o último corpo de cada endpoint em disco.
+
+    Cada endpoint é uma linha do SQLite (modo WAL), então uma resposta 200
+    grava só a sua linha e as páginas buscadas em paralelo não esperam
+    umas pelas outras. O arquivo sobrevive a reinícios do gunicorn e é
+    compartilhado entre os workers, então até a primeira requisição de um
+    worker novo pode ser condicional.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        try:
+            self._init_db()
+        except sqlite3.DatabaseError as e:
+            # Arquivo de outro formato (ex.: o JSON antigo): começa do zero
+            print(f"🏷️ Ignorando validadores inválidos em {self.path}: {e}")
+            try:
+                os.replace(self.path, f"{self.path}.invalid")
+            except FileNotFoundError:
+                # Outro worker já tirou o arquivo do caminho
+                pass
+            self._local = threading.local()
+            self._init_db()
+
+    def _connect(self):
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS validators (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                link TEXT,
+                body TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        ''')
+        count = conn.execute('SELECT COUNT(*) FROM validators').fetchone()[0]
+        if count:
+            print(f"🏷️ Validadores carregados: {count} endpoints")
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT etag, last_modified, link, body, stored_at FROM validators WHERE key = ?', (key,)
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'link': row[2],
+            'body': json.loads(row[3]),
+            'stored_at': row[4]
+        }
+
+    def put(self, key, etag, last_modified, body, link=None):
+        try:
+            self._connect().execute('''
+                INSERT INTO validators (key, etag, last_modified, link, body, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    link = excluded.link,
+                    body = excluded.body,
+                    stored_at = excluded.stored_at
+            ''', (key, etag, last_modified, link, json.dumps(body, ensure_ascii=False), time.time()))
+        except sqlite3.Error as e:
+            print(f"🏷️ Erro ao salvar validadores: {e}")
+
+
+class RateLimitExceeded(Exception):
+    """Cota da API esgotada; quem chamou deve usar os dados em cache"""
+
+    def __init__(self, resource, reset_at):
+        self.resource = resource
+        self.reset_at = reset_at
+        super().__init__(f"Limite da API do GitHub ({resource}) esgotado até {time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+
+
+class RateLimitGovernor:
+    """Controla o ritmo das chamadas a partir dos headers de rate limit.
+
+    Não espera nada enquanto houver folga na cota. Abaixo de `low_watermark`
+    chamadas restantes, espalha as chamadas até o reset (no máximo
+    `max_delay` por chamada). Com a cota zerada ou um Retry-After longo,
+    recusa a chamada imediatamente com RateLimitExceeded.
+    """
+
+    def __init__(self, low_watermark=50, max_delay=2.0):
+        self.low_watermark = low_watermark
+        self.max_delay = max_delay
+        self._resources = {}
+        self._blocked_until = 0
+        self._throttled = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def before_request(self, resource='core'):
+        """Chamado antes de cada requisição; pode dormir um pouco ou recusar"""
+        delay = self.reserve(resource)
+        if delay:
+            time.sleep(delay)
+
+    def reserve(self, resource='core'):
+        """Quanto esperar antes da próxima chamada (levanta se a cota acabou)"""
+        now = time.time()
+        with self._lock:
+            if self._blocked_until > now:
+                self._rejected += 1
+                raise RateLimitExceeded(resource, self._blocked_until)
+
+            info = self._resources.get(resource)
+            if not info or info['reset'] <= now:
+                return 0
+
+            if info['remaining'] <= 0:
+                self._rejected += 1
+                raise RateLimitExceeded(resource, info['reset'])
+
+            if info['remaining'] >= self.low_watermark:
+                return 0
+
+            delay = min(self.max_delay, (info['reset'] - now) / info['remaining'])
+            self._throttled += 1
+
+        print(f"🚦 Cota baixa ({info['remaining']} restantes), aguardando {delay:.2f}s")
+        return delay
+
+    def update(self, response):
+        """Atualiza o estado com os headers de uma resposta"""
+        headers = response.headers
+        with self._lock:
+            if 'X-RateLimit-Remaining' in headers:
+                try:
+                    resource = headers.get('X-RateLimit-Resource', 'core')
+                    self._resources[resource] = {
+                        'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                        'remaining': int(headers['X-RateLimit-Remaining']),
+                        'reset': int(headers.get('X-RateLimit-Reset', 0)),
+                        'updated_at': time.time()
+                    }
+                except ValueError:
+                    pass
+
+            retry_after = headers.get('Retry-After')
+            if retry_after and response.status_code in (403, 429):
+                try:
+                    self._blocked_until = max(self._blocked_until, time.time() + float(retry_after))
+                except ValueError:
+                    pass
+
+    def state(self):
+        """Estado atual para monitoramento"""
+        now = time.time()
+        with self._lock:
+            return {
+                'resources': {
+                    name: {**info, 'reset_in': max(0, round(info['reset'] - now))}
+                    for name, info in self._resources.items()
+                },
+                'blocked_for': max(0, round(self._blocked_until - now, 1)),
+                'throttled': self._throttled,
+                'rejected': self._rejected,
+                'low_watermark': self.low_watermark
+            }
+
+
+class GitHubClient:
+    """Cliente da API do GitHub com sessão HTTP compartilhada.
+
+    Uma única `requests.Session` mantém as conexões keep-alive abertas,
+    erros transitórios são repetidos com backoff exponencial e as
+    requisições de leitura podem ser condicionais (ETag/Last-Modified).
+    """
+
+    def __init__(self, token='', validators_path='github_validators.db', page_workers=4,
+                 connect_timeout=3.05, read_timeout=10, max_retries=3,
+                 backoff_base=0.5, backoff_max=8, rate_limit_watermark=50, breaker=None,
+                 api_url=GITHUB_API_URL, fixtures=None):
+        self.token = token
+        # Gravação/reprodução de respostas (GitHubFixtures) para testes offline
+        self.fixtures = fixtures
+        # Permite apontar para um servidor falso local (testes e benchmarks)
+        self.api_url = api_url.rstrip('/')
+        self.validators = ValidatorStore(validators_path)
+        self.governor = RateLimitGovernor(low_watermark=rate_limit_watermark)
+        # Com o GitHub degradado o circuito abre e as chamadas falham na hora
+        self.breaker = breaker or CircuitBreaker(name='github', slow_call_seconds=read_timeout / 2)
+        self.page_workers = page_workers
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Pool grande o bastante para todas as páginas em paralelo
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(page_workers, 1) * 2, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def headers(self):
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'Portfolio-Rudieri-App'
+        }
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+        return headers
+
+    def url(self, path):
+        return path if path.startswith('http') else f"{self.api_url}{path}"
+
+    def get(self, path, params=None, headers=None, timeout=None):
+        """GET com novas tentativas em erros 5xx, rede e limite secundário"""
+        return self.request('GET', path, params=params, headers=headers, timeout=timeout)
+
+    def post_json(self, path, payload, timeout=None, resource='core'):
+        """POST com corpo JSON (ex.: GraphQL), com a mesma política de retries"""
+        return self.request('POST', path, json=payload, timeout=timeout, resource=resource)
+
+    def request(self, method, path, params=None, headers=None, timeout=None, json=None, resource='core'):
+        """Requisição com circuit breaker, governor de rate limit e retries"""
+        url = self.url(path)
+        request_headers = {**self.headers(), **(headers or {})}
+        timeout = timeout or self.timeout
+
+        if self.fixtures and self.fixtures.replaying:
+            response = self.fixtures.replay(method, url, params, json, request_headers)
+            self.governor.update(response)
+            return response
+
+        attempt = 0
+        while True:
+            # O governor pode recusar a chamada: consulta antes de ocupar vaga no circuito
+            self.governor.before_request(resource)
+            self.breaker.before_call()
+            started = time.time()
+            try:
+                response = self.session.request(
+                    method, url, headers=request_headers, params=params, json=json, timeout=timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.breaker.record_failure(time.time() - started)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                print(f"🔁 Falha de rede em {url} ({e.__class__.__name__}), nova tentativa em {delay:.2f}s")
+            except requests.RequestException:
+                # ChunkedEncodingError e afins: falhou, mas não vale nova tentativa
+                self.breaker.record_failure(time.time() - started)
+                raise
+            except BaseException:
+                # A chamada não chegou a um resultado: devolve a vaga do circuito
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure(time.time() - started)
+                else:
+                    self.breaker.record_success(time.time() - started)
+                self.governor.update(response)
+
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    if self.fixtures and self.fixtures.recording:
+                        self.fixtures.record(method, url, params, json, response.status_code,
+                                             response.headers, response.text)
+                    return response
+                print(f"🔁 {url} retornou {response.status_code}, nova tentativa em {delay:.2f}s")
+
+            time.sleep(delay)
+            attempt += 1
+
+    def backoff(self, attempt):
+        # Backoff exponencial com "full jitter"
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def retry_delay(self, response, attempt):
+        """Espera antes de repetir a requisição, ou None se não deve repetir"""
+        if attempt >= self.max_retries:
+            return None
+
+        if response.status_code in RETRY_STATUSES:
+            return self.backoff(attempt)
+
+        if response.status_code in (403, 429) and is_secondary_rate_limit(response):
+            retry_after = response.headers.get('Retry-After')
+            if retry_after is None:
+                return self.backoff(attempt)
+            try:
+                retry_after = float(retry_after)
+            except ValueError:
+                return None
+            # Espera longa demais: melhor devolver o erro e usar o cache
+            return retry_after if retry_after <= self.backoff_max else None
+
+        return None
+
+    def get_json(self, path, params=None, timeout=None):
+        """GET condicional; retorna (response, dados).
+
+        Em um 304 os dados vêm do corpo guardado junto com os validadores.
+        """
+        url = self.url(path)
+        key, cached, headers = self.conditional_headers(url, params)
+        response = self.get(url, params=params, headers=headers, timeout=timeout)
+        return self.resolve_conditional(key, url, cached, response)
+
+    def conditional_headers(self, url, params=None):
+        """Chave no ValidatorStore, entrada guardada e headers condicionais"""
+        key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+        if self.fixtures and self.fixtures.recording:
+            # Gravando fixtures: sempre o 200 completo (um 304 não tem corpo para reproduzir)
+            return key, None, {}
+
+        headers = {}
+        cached = self.validators.get(key)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        return key, cached, headers
+
+    def resolve_conditional(self, key, url, cached, response):
+        """Transforma a resposta de um GET condicional em (response, dados)"""
+        if response.status_code == 304 and cached:
+            print(f"🏷️ 304 Not Modified: {url} (corpo reaproveitado)")
+            # O 304 nem sempre traz o Link; usa o guardado para a paginação
+            if cached.get('link') and 'Link' not in response.headers:
+                response.headers['Link'] = cached['link']
+            return response, cached['body']
+
+        if response.status_code == 200:
+            data = response.json()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.validators.put(key, etag, last_modified, data, response.headers.get('Link'))
+            return response, data
+
+        return response, None
+
+    def get_paginated(self, path, params=None, timeout=None):
+        """Busca todas as páginas de um endpoint de listagem.
+
+        A primeira página informa (pelo header Link) quantas páginas existem;
+        as páginas 2..N são buscadas em paralelo e concatenadas na ordem,
+        preservando a ordenação pedida ao GitHub.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', 100)
+
+        first_response, first_page = self.get_json(path, params={**params, 'page': 1}, timeout=timeout)
+        if first_page is None:
+            return first_response, None
+
+        last_page = last_page_number(first_response)
+        if last_page <= 1:
+            return first_response, list(first_page)
+
+        print(f"📚 Paginação: {last_page} páginas ({self.page_workers} em paralelo)")
+
+        def fetch_page(page):
+            response, data = self.get_json(path, params={**params, 'page': page}, timeout=timeout)
+            if data is None:
+                print(f"❌ Erro na página {page}: {response.status_code}")
+                response.raise_for_status()
+                raise requests.HTTPError(f"Página {page} retornou {response.status_code}", response=response)
+            return data
+
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            pages = list(executor.map(fetch_page, range(2, last_page + 1)))
+
+        return first_response, merge_pages([first_page] + pages)
+
+    def get_many_json(self, urls):
+        """Busca várias URLs em paralelo; retorna {url: dados} só das que deram certo"""
+        def fetch(url):
+            try:
+                response = self.get(url)
+                return url, response.json() if response.status_code == 200 else None
+            except Exception as e:
+                print(f"❌ Erro ao buscar {url}: {e}")
+                return url, None
+
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            results = dict(executor.map(fetch, urls))
+
+        return {url: data for url, data in results.items() if data is not None}
+
+
+def merge_pages(pages):
+    """Concatena páginas na ordem, sem repetir itens com o mesmo id"""
+    # Um item atualizado durante a busca pode mudar de página
+    items = []
+    seen_ids = set()
+    for page_items in pages:
+        for item in page_items:
+            item_id = item.get('id') if isinstance(item, dict) else None
+            if item_id is not None:
+                if item_id in seen_ids:
+                    continue
+                seen_ids.add(item_id)
+            items.append(item)
+
+    return items
+
+
+def is_secondary_rate_limit(response):
+    """403/429 do limite secundário (abuso), diferente do limite primário esgotado"""
+    if response.headers.get('Retry-After'):
+        return True
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        return False
+    try:
+        message = response.json().get('message', '')
+    except ValueError:
+        message = response.text or ''
+    return 'secondary rate limit' in message.lower()
+
+
+def last_page_number(response):
+    """Número da última página segundo o header Link (1 se não houver)"""
+    last = response.links.get('last') if response is not None else None
+    if not last:
+        return 1
+
+    try:
+        return int(parse_qs(urlparse(last['url']).query)['page'][0])
+    except (KeyError, IndexError, ValueError):
+        return 1
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers guardados nas fixtures (o resto varia a cada chamada e não importa)
+RECORDED_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Link', 'Retry-After',
+    'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset',
+    'X-RateLimit-Used', 'X-RateLimit-Resource'
+)
+
+
+class FixtureNotFound(Exception):
+    """Requisição sem fixture gravada (modo replay)"""
+
+
+class GitHubFixtures:
+    """Grava respostas reais da API em arquivos e as reproduz depois.
+
+    - mode='record': cada resposta é salva em `directory` (um JSON por
+      requisição, com status, headers de ETag/rate limit e corpo).
+    - mode='replay': nenhuma chamada de rede; as respostas vêm dos
+      arquivos. Um If-None-Match igual ao ETag gravado devolve 304, como
+      o GitHub faria.
+    """
+
+    def __init__(self, directory, mode='replay'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Modo de fixtures inválido: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    @property
+    def recording(self):
+        return self.mode == 'record'
+
+    def fixture_path(self, method, url, params=None, body=None):
+        key = json.dumps({
+            'method': method.upper(),
+            'url': url,
+            'params': sorted((str(k), str(v)) for k, v in (params or {}).items()),
+            'body': body
+        }, sort_keys=True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{method.lower()}_{digest}.json")
+
+    def record(self, method, url, params, body, status_code, headers, text):
+        if status_code == 304:
+            # Sem corpo para reproduzir; o replay gera os 304 a partir do ETag gravado
+            print(f"🎞️ 304 não gravado como fixture: {method.upper()} {url}")
+            return
+
+        fixture = {
+            'request': {'method': method.upper(), 'url': url, 'params': params, 'body': body},
+            'status': status_code,
+            'headers': {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            'body': text
+        }
+        path = self.fixture_path(method, url, params, body)
+        with self._lock:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(fixture, f, ensure_ascii=False, indent=2)
+
+    def replay(self, method, url, params=None, body=None, headers=None):
+        """Resposta (requests.Response) montada a partir da fixture"""
+        path = self.fixture_path(method, url, params, body)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            raise FixtureNotFound(f"Sem fixture para {method.upper()} {url} {params or ''} ({path})")
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(fixture['headers'])
+
+        etag = fixture['headers'].get('ETag')
+        if etag and (headers or {}).get('If-None-Match') == etag and fixture['status'] == 200:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = fixture['status']
+            response._content = fixture['body'].encode('utf-8')
+
+        return response
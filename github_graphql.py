@@ -0,0 +1,143 @@
+import time
+
+REPOSITORIES_QUERY = '''
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    login
+    name
+    bio
+    location
+    avatarUrl
+    url
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, privacy: PUBLIC,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        createdAt
+        updatedAt
+        pushedAt
+        stargazerCount
+        forkCount
+        diskUsage
+        primaryLanguage { name }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        latestRelease { tagName publishedAt }
+      }
+    }
+  }
+  rateLimit { cost remaining resetAt }
+}
+'''
+
+
+class GraphQLError(Exception):
+    """Resposta GraphQL com erros"""
+
+
+class GraphQLFetcher:
+    """Busca perfil e repositórios em poucas consultas GraphQL paginadas.
+
+    Cada página traz até `page_size` repositórios já com tópicos, linguagens
+    (bytes) e contadores, no lugar de 1 + N chamadas REST. O resultado é
+    convertido para o mesmo formato da API REST, então
+    `build_github_project()` não muda.
+    """
+
+    def __init__(self, client, page_size=100):
+        if not client.token:
+            raise ValueError("GraphQL exige GITHUB_TOKEN")
+        self.client = client
+        self.page_size = page_size
+
+    def fetch_user_and_repos(self, username):
+        started = time.time()
+        user_data = {}
+        repos_data = []
+        cursor = None
+        queries = 0
+
+        while True:
+            data = self.query(REPOSITORIES_QUERY, {
+                'login': username,
+                'first': self.page_size,
+                'after': cursor
+            })
+            queries += 1
+
+            user = data.get('user')
+            if not user:
+                raise GraphQLError(f"Usuário {username} não encontrado")
+
+            repositories = user['repositories']
+            if not user_data:
+                user_data = map_user(user, repositories['totalCount'])
+
+            repos_data.extend(map_repository(node) for node in repositories['nodes'] if node)
+
+            page_info = repositories['pageInfo']
+            if not page_info['hasNextPage']:
+                break
+            cursor = page_info['endCursor']
+
+        print(f"🔷 GraphQL: {len(repos_data)} repos em {queries} consultas ({time.time() - started:.2f}s)")
+        return user_data, repos_data
+
+    def query(self, query, variables):
+        response = self.client.post_json('/graphql', {'query': query, 'variables': variables}, resource='graphql')
+        if response.status_code != 200:
+            response.raise_for_status()
+            raise GraphQLError(f"GraphQL retornou {response.status_code}")
+
+        payload = response.json()
+        if payload.get('errors'):
+            raise GraphQLError('; '.join(error.get('message', '?') for error in payload['errors']))
+        return payload.get('data') or {}
+
+
+def map_user(user, total_repos):
+    """Perfil GraphQL → formato de /users/{login}"""
+    return {
+        'login': user.get('login'),
+        'name': user.get('name'),
+        'bio': user.get('bio'),
+        'location': user.get('location'),
+        'avatar_url': user.get('avatarUrl'),
+        'html_url': user.get('url'),
+        'public_repos': total_repos
+    }
+
+
+def map_repository(node):
+    """Repositório GraphQL → formato de /users/{login}/repos (+ languages, topics)"""
+    return {
+        'id': node['databaseId'],
+        'name': node['name'],
+        'description': node.get('description'),
+        'html_url': node['url'],
+        'homepage': node.get('homepageUrl'),
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'pushed_at': node.get('pushedAt'),
+        'stargazers_count': node.get('stargazerCount', 0),
+        'forks_count': node.get('forkCount', 0),
+        'size': node.get('diskUsage') or 0,
+        'languages': {
+            edge['node']['name']: edge['size']
+            for edge in (node.get('languages') or {}).get('edges', [])
+        },
+        'topics': [
+            topic_node['topic']['name']
+            for topic_node in (node.get('repositoryTopics') or {}).get('nodes', [])
+        ],
+        'latest_release': node.get('latestRelease')
+    }
@@ -0,0 +1,97 @@
+import time
+
+
+class LanguageStats:
+    """Bytes por linguagem de cada repositório (endpoint `languages_url`).
+
+    O resultado de cada repositório fica guardado no SnapshotStore junto com
+    o `pushed_at` usado na busca: repositórios sem push novo nunca são
+    buscados de novo. Os que mudaram são buscados todos em paralelo, até
+    o limite da cota que sobra acima do `low_watermark` do governor; o
+    resto fica para as próximas sincronizações.
+    """
+
+    STORE_KEY = 'github_languages'
+
+    def __init__(self, client, store, async_fetcher=None):
+        self.client = client
+        self.store = store
+        self.async_fetcher = async_fetcher
+
+    def enrich(self, repos):
+        """Retorna cópias dos repositórios com o campo `languages` preenchido"""
+        previous = self.store.get(self.STORE_KEY)[1] or {}
+        cache = dict(previous)
+
+        stale = [
+            repo for repo in repos
+            if repo.get('languages_url')
+            and cache.get(str(repo['id']), {}).get('pushed_at') != repo.get('pushed_at')
+        ]
+
+        cached = len(repos) - len(stale)
+        budget = self.fetch_budget(len(stale))
+        if budget < len(stale):
+            print(f"🈯 Linguagens: cota baixa, buscando {budget} de {len(stale)} repositórios "
+                  f"(o resto na próxima sincronização)")
+            stale = stale[:budget]
+
+        if stale:
+            started = time.time()
+            urls = [repo['languages_url'] for repo in stale]
+            fetcher = self.async_fetcher or self.client
+            results = fetcher.get_many_json(urls)
+
+            for repo in stale:
+                languages = results.get(repo['languages_url'])
+                if languages is not None:
+                    cache[str(repo['id'])] = {'pushed_at': repo.get('pushed_at'), 'languages': languages}
+
+            print(f"🈯 Linguagens: {len(stale)} repositórios buscados em {time.time() - started:.2f}s "
+                  f"({cached} do cache)")
+
+        # Remove repositórios que não existem mais
+        current_ids = {str(repo['id']) for repo in repos}
+        cache = {repo_id: entry for repo_id, entry in cache.items() if repo_id in current_ids}
+        if cache != previous:
+            self.store.publish(self.STORE_KEY, cache)
+
+        return [
+            {**repo, 'languages': cache.get(str(repo['id']), {}).get('languages', {})}
+            for repo in repos
+        ]
+
+    def fetch_budget(self, wanted):
+        """Quantos repositórios dá para buscar sem gastar a cota da sincronização principal"""
+        governor = self.client.governor
+        core = governor.state()['resources'].get('core')
+        if not core or core['reset_in'] <= 0:
+            return wanted
+        return max(0, min(wanted, core['remaining'] - governor.low_watermark))
+
+
+def aggregate_language_bytes(projects):
+    """Soma os bytes por linguagem de todos os projetos, do maior para o menor.
+
+    Projetos sem detalhamento (ex.: customizados) entram só com a linguagem
+    principal, sem bytes.
+    """
+    totals = {}
+    for project in projects:
+        languages = project.get('languages') or {}
+        for language, size in languages.items():
+            totals[language] = totals.get(language, 0) + size
+
+        primary = project.get('language')
+        if not languages and primary and primary != 'N/A':
+            totals.setdefault(primary, 0)
+
+    total_bytes = sum(totals.values())
+    return [
+        {
+            'language': language,
+            'bytes': size,
+            'percent': round(size * 100 / total_bytes, 1) if total_bytes else 0
+        }
+        for language, size in sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    ]
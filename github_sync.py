@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+import traceback
+from datetime import datetime
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Sem flock (Windows): cada processo se considera líder
+    FCNTL_AVAILABLE = False
+
+
+class GitHubSync:
+    """Sincroniza os dados do GitHub em segundo plano.
+
+    Um único processo (o líder, eleito por flock em um arquivo de lock)
+    busca os dados a cada `interval` segundos e publica o snapshot no
+    SnapshotStore compartilhado. Todos os workers apenas leem o último
+    snapshot publicado, então as rotas nunca dependem da latência do GitHub.
+
+    Os dados ('github') só ganham versão nova quando mudam; o status de cada
+    execução fica em uma entrada separada ('github_status').
+    """
+
+    def __init__(self, fetch, store, interval=300, poll_interval=2, metrics=None):
+        self.fetch = fetch
+        self.store = store
+        # Métricas do líder (ex.: rate limit) gravadas junto com o status
+        self.metrics = metrics
+        self.lock_path = f"{store.path}.sync.lock"
+        self.refresh_path = f"{store.path}.sync.refresh"
+        self.interval = interval
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._lock_file = None
+        self._started_pid = None
+        self._syncing = False
+
+    # ===== Leitura =====
+
+    def snapshot(self):
+        """Último snapshot publicado (ou None se nunca houve sincronização)"""
+        return self.store.get('github')[1]
+
+    def version(self):
+        """Versão dos dados publicados; muda só quando o GitHub muda"""
+        return self.store.version('github')
+
+    def status(self):
+        """Situação da sincronização: última execução, duração e erro"""
+        snapshot = self.snapshot() or {}
+        return {
+            **(self.store.get('github_status')[1] or {}),
+            'version': self.version(),
+            'repos': len(snapshot.get('repos', [])),
+            'interval': self.interval,
+            'pid': os.getpid(),
+            'is_leader': self.is_leader,
+            'syncing': self._syncing,
+            'refresh_pending': os.path.exists(self.refresh_path)
+        }
+
+    # ===== Worker =====
+
+    @property
+    def is_leader(self):
+        return self._lock_file is not None or not FCNTL_AVAILABLE
+
+    def start(self):
+        """Inicia a thread de sincronização (uma vez por processo)"""
+        if self._started_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            # Depois de um fork o lock e a thread do processo pai não valem mais
+            self._started_pid = os.getpid()
+            self._lock_file = None
+            thread = threading.Thread(target=self._run, name='github-sync', daemon=True)
+            thread.start()
+            print(f"🛰️ Sync GitHub iniciado no processo {os.getpid()} (intervalo {self.interval}s)")
+
+    def request_refresh(self):
+        """Pede uma sincronização imediata ao líder (qualquer worker pode pedir)"""
+        with open(self.refresh_path, 'w', encoding='utf-8') as f:
+            f.write(str(time.time()))
+        self._wake.set()
+
+    def _try_become_leader(self):
+        if not FCNTL_AVAILABLE or self._lock_file is not None:
+            return
+
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return
+
+        self._lock_file = lock_file
+        print(f"🛰️ Processo {os.getpid()} é o líder da sincronização")
+
+    def _sync_due(self):
+        if os.path.exists(self.refresh_path):
+            return True
+
+        if not self.snapshot():
+            return True
+
+        last_sync = (self.store.get('github_status')[1] or {}).get('last_sync_ts', 0)
+        return time.time() - last_sync >= self.interval
+
+    def _run(self):
+        while True:
+            try:
+                self._try_become_leader()
+                if self.is_leader and self._sync_due():
+                    self.sync_now()
+            except Exception as e:
+                print(f"🛰️ Erro no loop de sincronização: {e}")
+                print(f"🛰️ Stack: {traceback.format_exc()}")
+
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def sync_now(self):
+        """Busca os dados e publica um snapshot novo"""
+        try:
+            os.remove(self.refresh_path)
+        except FileNotFoundError:
+            pass
+
+        previous = self.snapshot() or {}
+        previous_status = self.store.get('github_status')[1] or {}
+        started = time.time()
+        self._syncing = True
+        error = None
+
+        try:
+            user_data, repos_data = self.fetch()
+        except Exception as e:
+            error = str(e)
+            print(f"🛰️ Erro na sincronização do GitHub: {e}")
+        finally:
+            self._syncing = False
+
+        duration = round(time.time() - started, 3)
+        status = {
+            **previous_status,
+            'last_sync_at': datetime.now().isoformat(),
+            'last_sync_ts': started,
+            'duration': duration,
+            'error': error,
+            'leader_pid': os.getpid()
+        }
+        if error is None:
+            status['last_success_at'] = status['last_sync_at']
+        if self.metrics:
+            try:
+                status.update(self.metrics())
+            except Exception as e:
+                print(f"🛰️ Erro ao coletar métricas: {e}")
+
+        snapshot = previous
+        if error is None:
+            # Falha só no usuário: mantém o perfil anterior
+            user_data = user_data or previous.get('user', {})
+            if (user_data, repos_data) != (previous.get('user'), previous.get('repos')):
+                snapshot = {'user': user_data, 'repos': repos_data}
+                self.store.publish('github', snapshot)
+
+        self.store.publish('github_status', status)
+        print(f"🛰️ Sync GitHub: {len(snapshot.get('repos', []))} repos em {duration}s (versão {self.version()}, erro: {error or 'nenhum'})")
+        return snapshot
+
+    def apply_repo_update(self, repo, removed=False):
+        """Aplica a mudança de um único repositório (ex.: webhook) ao snapshot.
+
+        Mescla os campos recebidos no repositório guardado e o reposiciona
+        pela data de atualização, sem buscar nada no GitHub. Retorna
+        (repositório mesclado, versão nova, versão em que a mudança se baseou).
+        """
+        base_version, previous = self.store.get('github')
+        previous = previous or {'user': {}, 'repos': []}
+        repos = list(previous.get('repos', []))
+
+        index = next((i for i, r in enumerate(repos) if r.get('id') == repo['id']), None)
+        existing = repos.pop(index) if index is not None else {}
+        merged = {**existing, **repo}
+
+        if not removed:
+            insert_by_updated_at(repos, merged)
+
+        version = self.store.publish('github', {**previous, 'repos': repos})
+        print(f"🛰️ Repositório {merged.get('name', repo['id'])} {'removido' if removed else 'atualizado'} (versão {version})")
+        return merged, version, base_version
+
+
+def insert_by_updated_at(items, item):
+    """Insere mantendo a ordem por updated_at decrescente (como sort=updated)"""
+    updated_at = item.get('updated_at') or ''
+    position = next(
+        (i for i, other in enumerate(items) if (other.get('updated_at') or '') <= updated_at),
+        len(items)
+    )
+    items.insert(position, item)
+    return position
@@ -6,6 +6,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from io import BytesIO
 from datetime import datetime
+from github_languages import aggregate_language_bytes
 
 def generate_resume_reportlab(user_data, categorized_projects, all_projects):
     """Gera currículo usando ReportLab"""
@@ -29,7 +30,7 @@ def generate_resume_reportlab(user_data, categorized_projects, all_projects):
         'apis': len(categorized_projects.get('api', [])),
         'web': len(categorized_projects.get('web', [])),
         'mobile': len(categorized_projects.get('mobile', [])),
-        'languages': len(set([p.get('language', 'N/A') for p in all_projects if p.get('language') and p.get('language') != 'N/A'])),
+        'languages': len(aggregate_language_bytes(all_projects)),
         'years_experience': 5
     }
     
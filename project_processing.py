@@ -0,0 +1,210 @@
+import hashlib
+import json
+import threading
+
+from categorizer import CategoryRules
+from project_record import ProjectRecord
+
+PROJECT_COLORS = [
+    'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+    'linear-gradient(135deg, #f093fb 0%, #f5576c 100%)',
+    'linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)',
+    'linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)',
+    'linear-gradient(135deg, #fa709a 0%, #fee140 100%)',
+    'linear-gradient(135deg, #a8edea 0%, #fed6e3 100%)',
+    'linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%)',
+    'linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%)',
+    'linear-gradient(135deg, #feca57 0%, #ff9ff3 100%)',
+    'linear-gradient(135deg, #54a0ff 0%, #5f27cd 100%)'
+]
+
+
+# Regras embutidas; o app usa as do arquivo configurado (CATEGORY_RULES_FILE)
+default_category_rules = CategoryRules()
+
+
+def auto_categorize_github_repo(repo_name, language, description, rules=None):
+    """Categorização inteligente automática"""
+    return (rules or default_category_rules).categorize(repo_name, description)
+
+
+def get_project_gallery(project_id, gallery_data):
+    """Obtém galeria de um projeto específico"""
+    return gallery_data.get(project_id, {
+        'main_image': '',
+        'images': [],
+        'modules': {}
+    })
+
+
+def build_github_project(repo, metadata, gallery, color, category=None):
+    """Monta o dicionário de um projeto a partir do repositório e metadados locais.
+
+    `category` é a categoria automática já calculada (ex.: em lote); sem
+    ela, o repositório é categorizado aqui. Retorna um ProjectRecord.
+    """
+    repo_id = str(repo['id'])
+
+    # Categorização
+    category = metadata.get('category') or category or auto_categorize_github_repo(
+        repo['name'],
+        repo.get('language'),
+        repo.get('description')
+    )
+
+    # Título
+    title = metadata.get('title') or repo['name'].replace('-', ' ').replace('_', ' ').title()
+
+    # Descrição
+    description = metadata.get('description') or repo.get('description') or f"Projeto desenvolvido em {repo.get('language', 'Python')}"
+
+    return ProjectRecord({
+        'id': f"github_{repo_id}",
+        'github_id': repo_id,
+        'title': title,
+        'description': description,
+        'category': category,
+        'source': 'github',
+        'github_url': repo['html_url'],
+        'demo_url': repo.get('homepage') or metadata.get('demo_url', ''),
+        'language': repo.get('language') or 'N/A',
+        'languages': repo.get('languages', {}),
+        'color': color,
+        'main_image': gallery.get('main_image', ''),
+        'gallery': gallery.get('images', []),
+        'modules': gallery.get('modules', {}),
+        'tags': metadata.get('tags', []),
+        'featured': metadata.get('featured', False),
+        'created_at': repo['created_at'],
+        'updated_at': repo['updated_at'],
+        'stars': repo.get('stargazers_count', 0),
+        'forks': repo.get('forks_count', 0),
+        'size': repo.get('size', 0)
+    })
+
+
+def fingerprint(value):
+    """Versão (hash) de um trecho dos dados locais; None se não existir"""
+    if value is None:
+        return None
+    # default=dict: aceita as visões imutáveis (MappingProxyType) dos dados locais
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=dict).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+# Campos preenchidos depois da busca (linguagens) ou que mudam sem mexer no
+# updated_at (estrelas, forks): entram na chave do memo por hash
+ENRICHMENT_FIELDS = ('languages', 'stargazers_count', 'forks_count')
+
+
+class ProjectMemo:
+    """Memo dos projetos do GitHub já processados.
+
+    Cada projeto fica guardado pelo id do repositório junto com a chave
+    (updated_at, pushed_at, hash de ENRICHMENT_FIELDS, versão dos metadados,
+    versão da galeria). Num novo
+    processamento só os repositórios cuja chave mudou passam de novo por
+    `build_github_project()`; os outros reaproveitam o dicionário pronto.
+
+    As versões de metadados/galerias são hashes calculados uma vez por
+    versão do arquivo de dados (`stamp`), então um refresh sem mudanças
+    locais não percorre os metadados de novo. Se as regras de categoria
+    forem recarregadas, o memo inteiro é descartado.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or default_category_rules
+        self._entries = {}
+        self._rules_version = None
+        self._versions_stamp = None
+        self._metadata_versions = {}
+        self._gallery_versions = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'recolors': 0, 'runs': 0}
+
+    def _versions(self, github_metadata, galleries, stamp):
+        if stamp is None or stamp != self._versions_stamp:
+            self._metadata_versions = {
+                repo_id: fingerprint(metadata) for repo_id, metadata in github_metadata.items()
+            }
+            # Indexado pelo id do repositório (as galerias usam "github_<id>")
+            self._gallery_versions = {
+                project_id[len('github_'):]: fingerprint(gallery)
+                for project_id, gallery in galleries.items()
+                if project_id.startswith('github_')
+            }
+            self._versions_stamp = stamp
+        return self._metadata_versions, self._gallery_versions
+
+    def process(self, repos, github_metadata, galleries, stamp=None):
+        """Lista de projetos processados, na ordem de `repos`.
+
+        Retorna (projetos, quantos foram reprocessados).
+        """
+        with self._lock:
+            # Regras de categoria novas: todos os projetos precisam ser recategorizados
+            self.rules.reload_if_changed()
+            if self.rules.version != self._rules_version:
+                self._entries = {}
+                self._rules_version = self.rules.version
+
+            metadata_versions, gallery_versions = self._versions(github_metadata, galleries, stamp)
+            entries = {}
+            projects = []
+            stale = []
+
+            for i, repo in enumerate(repos):
+                repo_id = str(repo['id'])
+                color = PROJECT_COLORS[i % len(PROJECT_COLORS)]
+                key = (
+                    repo.get('updated_at'),
+                    repo.get('pushed_at'),
+                    fingerprint({field: repo.get(field) for field in ENRICHMENT_FIELDS}),
+                    metadata_versions.get(repo_id),
+                    gallery_versions.get(repo_id)
+                )
+
+                entry = self._entries.get(repo_id)
+                if entry is not None and entry[0] == key:
+                    project = entry[1]
+                    self._stats['hits'] += 1
+                    if project['color'] != color:
+                        # Só a posição mudou: troca a cor sem reprocessar
+                        project = project.replace(color=color)
+                        self._stats['recolors'] += 1
+                    entries[repo_id] = (key, project)
+                else:
+                    stale.append((i, repo, repo_id, key, color))
+                    project = None
+
+                projects.append(project)
+
+            # Os que mudaram são categorizados em lote e montados de novo
+            categories = self.rules.categorize_many(
+                (repo['name'], repo.get('description')) for _, repo, _, _, _ in stale
+            )
+            for (i, repo, repo_id, key, color), category in zip(stale, categories):
+                project = build_github_project(
+                    repo,
+                    github_metadata.get(repo_id, {}),
+                    get_project_gallery(f"github_{repo_id}", galleries),
+                    color,
+                    category
+                )
+                entries[repo_id] = (key, project)
+                projects[i] = project
+
+            # Repositórios que sumiram saem do memo
+            self._entries = entries
+            self._stats['misses'] += len(stale)
+            self._stats['runs'] += 1
+            return projects, len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._versions_stamp = None
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries)}
@@ -0,0 +1,146 @@
+import sys
+from collections.abc import Mapping
+
+# Campos conhecidos dos projetos (GitHub e customizados); o resto vai para `_extra`
+PROJECT_FIELDS = (
+    'id', 'github_id', 'title', 'description', 'category', 'source', 'github_url',
+    'demo_url', 'language', 'languages', 'color', 'main_image', 'image', 'gallery',
+    'modules', 'tags', 'featured', 'created_at', 'updated_at', 'stars', 'forks', 'size'
+)
+_FIELD_SET = frozenset(PROJECT_FIELDS)
+
+# Valores que se repetem em milhares de projetos: uma única string por valor
+_INTERNED_FIELDS = frozenset(('category', 'language', 'source', 'color'))
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class ProjectRecord(Mapping):
+    """Projeto processado em formato compacto (`__slots__`, sem __dict__).
+
+    Categoria, linguagem, origem, cor e nomes de linguagem são strings
+    internadas, compartilhadas entre todos os projetos. Campos ausentes
+    continuam ausentes (como no dicionário original), então no Jinja
+    `project.stars is defined` segue funcionando, e `project.title`
+    lê o slot direto.
+
+    Implementa a interface de Mapping (`project['title']`,
+    `project.get(...)`, `dict(project)`, `{**project}`), então o código que
+    tratava os projetos como dicionários continua igual. Para JSON use
+    `to_dict()` (o app registra isso no provider do Flask e o
+    SnapshotStore também).
+    """
+
+    __slots__ = PROJECT_FIELDS + ('_extra',)
+
+    def __init__(self, data=(), **fields):
+        if fields:
+            data = {**data, **fields}
+        extra = None
+        setters = _SETTERS
+        for key, value in (data.items() if data else ()):
+            try:
+                setters[key](self, value)
+            except KeyError:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        _set_extra(self, extra)
+
+        for key in _INTERNED_FIELDS:
+            value = getattr(self, key, None)
+            if type(value) is str:
+                setters[key](self, sys.intern(value))
+        languages = getattr(self, 'languages', None)
+        if languages:
+            setters['languages'](self, {_intern(language): size for language, size in languages.items()})
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, ProjectRecord):
+            return data
+        return cls(data)
+
+    def _set(self, key, value):
+        if key in _FIELD_SET:
+            if key in _INTERNED_FIELDS:
+                value = _intern(value)
+            elif key == 'languages' and value:
+                value = {_intern(language): size for language, size in value.items()}
+            _SETTERS[key](self, value)
+        else:
+            if self._extra is None:
+                _set_extra(self, {})
+            self._extra[key] = value
+
+    def replace(self, **changes):
+        """Cópia com alguns campos trocados"""
+        record = ProjectRecord.__new__(ProjectRecord)
+        _set_extra(record, dict(self._extra) if self._extra else None)
+        for key in PROJECT_FIELDS:
+            try:
+                _SETTERS[key](record, getattr(self, key))
+            except AttributeError:
+                pass
+        for key, value in changes.items():
+            record._set(key, value)
+        return record
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in PROJECT_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, ProjectRecord):
+            if self._extra != other._extra:
+                return False
+            missing = object()
+            return all(
+                getattr(self, key, missing) == getattr(other, key, missing)
+                for key in PROJECT_FIELDS
+            )
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ProjectRecord é imutável; use replace()")
+
+    def __reduce__(self):
+        return (ProjectRecord, (self.to_dict(),))
+
+    def __repr__(self):
+        return f"ProjectRecord(id={self.get('id')!r}, title={self.get('title')!r})"
+
+
+# Escrita direta nos slots (o __setattr__ público é bloqueado)
+_SETTERS = {name: getattr(ProjectRecord, name).__set__ for name in PROJECT_FIELDS}
+_set_extra = ProjectRecord._extra.__set__
@@ -0,0 +1,965 @@
+"""Armazenamento dos dados locais do portfólio (projetos customizados,
+metadados dos projetos do GitHub e galerias de imagens).
+
+Dois backends com as mesmas operações:
+    - JsonProjectStore: o portfolio_data.json como snapshot, mais um log de
+      alterações só de acréscimo (compactado de tempos em tempos)
+    - SqliteProjectStore: SQLite em modo WAL, uma linha por projeto,
+      metadado e imagem; cada operação grava só as linhas afetadas
+
+`load()` devolve uma visão imutável (MappingProxyType/tuplas) compartilhada
+entre as leituras e só decodifica de novo quando os dados mudam; as
+operações de escrita trabalham numa cópia (copy-on-write).
+
+Concorrência otimista: cada documento (um projeto customizado, os
+metadados de um repositório, a galeria de um projeto) tem um número de
+versão. Uma escrita lê o documento e a versão, aplica a alteração fora de
+qualquer trava e grava com compare-and-swap; se outro worker gravou o
+mesmo documento nesse meio tempo, a alteração é refeita sobre a versão
+nova. Escritas em documentos diferentes nunca esperam umas pelas outras
+(além do acréscimo ao log / da transação curta do SQLite).
+
+Migração única do JSON para o SQLite:
+    python project_store.py migrate portfolio_data.json portfolio_data.db
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+
+from blob_store import image_ref
+from change_log import ChangeLog, write_atomic
+
+# Tipos de documento e a seção do JSON onde cada um fica
+DOCUMENT_SECTIONS = {
+    'custom': 'custom_projects',
+    'github': 'github_metadata',
+    'gallery': 'project_galleries'
+}
+
+
+def empty_project_data():
+    return {
+        'custom_projects': [],
+        'github_metadata': {},
+        'project_galleries': {}
+    }
+
+
+def empty_gallery():
+    return {
+        'main_image': '',
+        'images': [],
+        'modules': {}
+    }
+
+
+def freeze(value):
+    """Cópia imutável (dicionários viram MappingProxyType, listas viram tuplas)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Cópia mutável de uma visão congelada (ou de dados comuns)"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def find_document(view, kind, key):
+    """Documento `kind`/`key` dentro dos dados no formato do JSON (None se não existe)"""
+    if kind == 'custom':
+        return next((project for project in view.get('custom_projects', ()) if project['id'] == key), None)
+    return view.get(DOCUMENT_SECTIONS[kind], {}).get(key)
+
+
+def put_version(versions, kind, key, version, value):
+    """Novas versões dos documentos (documento removido volta à versão 0)"""
+    versions = dict(versions)
+    if value is None:
+        versions.pop(f"{kind}:{key}", None)
+    else:
+        versions[f"{kind}:{key}"] = version
+    return versions
+
+
+def put_document(view, kind, key, value):
+    """Nova visão congelada com o documento trocado (None remove).
+
+    Só a seção alterada é copiada (raso); o resto é compartilhado com a
+    visão anterior.
+    """
+    if kind == 'custom':
+        projects = view.get('custom_projects', ())
+        position = next((i for i, project in enumerate(projects) if project['id'] == key), None)
+        if position is None:
+            projects = projects + (value,) if value is not None else projects
+        elif value is None:
+            projects = projects[:position] + projects[position + 1:]
+        else:
+            projects = projects[:position] + (value,) + projects[position + 1:]
+        return MappingProxyType({**view, 'custom_projects': projects})
+
+    section = DOCUMENT_SECTIONS[kind]
+    items = dict(view.get(section, {}))
+    if value is None:
+        items.pop(key, None)
+    else:
+        items[key] = value
+    return MappingProxyType({**view, section: MappingProxyType(items)})
+
+
+class ParseStats:
+    """Quantas vezes os dados foram decodificados e quantos bytes isso leu.
+
+    Guarda o total do processo e, por thread, o da requisição atual
+    (`reset_request()` no início de cada requisição).
+    """
+
+    FIELDS = ('parses', 'bytes_parsed', 'cache_hits')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._totals = dict.fromkeys(self.FIELDS, 0)
+
+    def record(self, field, amount=1):
+        with self._lock:
+            self._totals[field] += amount
+        counts = getattr(self._local, 'counts', None)
+        if counts is not None:
+            counts[field] += amount
+
+    def reset_request(self):
+        self._local.counts = dict.fromkeys(self.FIELDS, 0)
+
+    def request(self):
+        return dict(getattr(self._local, 'counts', None) or dict.fromkeys(self.FIELDS, 0))
+
+    def totals(self):
+        with self._lock:
+            return dict(self._totals)
+
+
+def image_module(image, gallery):
+    """Módulo de uma imagem (campo `module` ou o módulo em que ela aparece)"""
+    if image.get('module'):
+        return image['module']
+    for module, images in gallery.get('modules', {}).items():
+        if any(other.get('id') == image.get('id') for other in images):
+            return module
+    return 'geral'
+
+
+# Mutações das operações do admin: recebem uma cópia mutável do documento
+# (None se não existe) e retornam (documento novo, resultado). Usadas pelo
+# ProjectStore e na tradução dos registros antigos do log.
+
+def _add_images_mutation(images, is_main=False):
+    def mutation(gallery):
+        gallery = gallery or empty_gallery()
+        for image in images:
+            gallery['images'].append(image)
+            gallery['modules'].setdefault(image['module'], []).append(image)
+            if is_main or not gallery['main_image']:
+                gallery['main_image'] = image_ref(image)
+        return gallery, len(gallery['images'])
+    return mutation
+
+
+def _delete_image_mutation(image_id):
+    def mutation(gallery):
+        if gallery is None:
+            return None, False
+
+        gallery['images'] = [img for img in gallery['images'] if img.get('id') != image_id]
+        for module in gallery['modules']:
+            gallery['modules'][module] = [img for img in gallery['modules'][module] if img.get('id') != image_id]
+
+        if gallery.get('main_image'):
+            main_exists = any(img for img in gallery['images'] if image_ref(img) == gallery['main_image'])
+            if not main_exists:
+                gallery['main_image'] = image_ref(gallery['images'][0]) if gallery['images'] else ''
+        return gallery, True
+    return mutation
+
+
+def _set_main_mutation(image_id):
+    def mutation(gallery):
+        target = next((img for img in (gallery or {}).get('images', []) if img.get('id') == image_id), None)
+        if target is None:
+            return gallery, False
+        gallery['main_image'] = image_ref(target)
+        return gallery, True
+    return mutation
+
+
+def _put_mutation(value):
+    return lambda current: (thaw(value), True)
+
+
+def _remove_mutation(current):
+    return None, current is not None
+
+
+# Registros do log no formato por operação ({"seq", "op", "args"}), de antes
+# do versionamento: cada operação vira as mutações dos documentos afetados
+LEGACY_OPERATIONS = {
+    'add_custom_project': lambda project: [('custom', project['id'], _put_mutation(project))],
+    'delete_custom_project': lambda project_id: [
+        ('custom', project_id, _remove_mutation),
+        ('gallery', project_id, _remove_mutation)
+    ],
+    'set_github_metadata': lambda github_id, metadata: [('github', github_id, _put_mutation(metadata))],
+    'add_gallery_images': lambda project_id, images, is_main=False: [
+        ('gallery', project_id, _add_images_mutation(images, is_main))
+    ],
+    'delete_gallery_image': lambda project_id, image_id: [('gallery', project_id, _delete_image_mutation(image_id))],
+    'set_main_image': lambda project_id, image_id: [('gallery', project_id, _set_main_mutation(image_id))],
+    'replace_galleries': lambda galleries: [
+        ('gallery', project_id, _put_mutation(gallery)) for project_id, gallery in galleries.items()
+    ]
+}
+
+
+def document_version(versions, kind, key, document):
+    """Versão de um documento (anteriores ao versionamento começam na 1; ausente é 0)"""
+    if document is None:
+        return 0
+    return versions.get(f"{kind}:{key}", 1)
+
+
+def log_record_puts(view, versions, record):
+    """Gravações de documento de um registro do log: [(kind, key, versão, valor)].
+
+    Registros no formato por operação são traduzidos aplicando a operação
+    à visão atual; cada documento alterado ganha a versão seguinte.
+    """
+    if 'kind' in record:
+        return [(record['kind'], record['key'], record['version'], record['value'])]
+
+    if record.get('op') not in LEGACY_OPERATIONS:
+        raise ValueError(f"Registro desconhecido no log de alterações (#{record.get('seq')}): {record}")
+
+    puts = []
+    for kind, key, mutation in LEGACY_OPERATIONS[record['op']](**record['args']):
+        current = find_document(view, kind, key)
+        document, result = mutation(thaw(current) if current is not None else None)
+        if result is False:
+            continue
+        version = document_version(versions, kind, key, current) + 1
+        puts.append((kind, key, version, document))
+        view = put_document(view, kind, key, freeze(document))
+        versions = put_version(versions, kind, key, version, document)
+    return puts
+
+
+class VersionConflict(Exception):
+    """A versão do documento não é a esperada (outro worker gravou antes)"""
+
+    def __init__(self, kind, key, current_version):
+        super().__init__(f"{kind} {key}: versão atual é {current_version}")
+        self.kind = kind
+        self.key = key
+        self.current_version = current_version
+
+    def __reduce__(self):
+        return (VersionConflict, (self.kind, self.key, self.current_version))
+
+
+class ProjectStore:
+    """Operações do admin sobre documentos versionados.
+
+    Os backends implementam `get_document(kind, key)` → (documento,
+    versão) e `compare_and_swap(kind, key, versão esperada, documento)` →
+    versão nova (ou VersionConflict). As operações retornam
+    (resultado, versão do documento).
+    """
+
+    max_retries = 10
+    # Espera máxima (s) antes de refazer, sorteada para os workers não colidirem de novo
+    retry_backoff = 0.02
+
+    def __init__(self):
+        self._occ_lock = threading.Lock()
+        self._occ_stats = {'writes': 0, 'retries': 0, 'conflicts': 0}
+
+    def _count(self, field):
+        with self._occ_lock:
+            self._occ_stats[field] += 1
+
+    def update_document(self, kind, key, mutation, expected_version=None):
+        """Lê, altera e grava um documento com compare-and-swap.
+
+        `mutation(documento)` recebe uma cópia mutável (ou None se o
+        documento não existe) e retorna (documento novo, resultado); um
+        documento novo None remove, e resultado False cancela sem gravar.
+        Se outro worker gravar o documento no meio, a mutação é refeita
+        sobre a versão nova. Com `expected_version` (If-Match), o documento
+        precisa estar nessa versão: qualquer diferença vira VersionConflict.
+        """
+        for attempt in range(self.max_retries):
+            document, version = self.get_document(kind, key)
+            if expected_version is not None and version != expected_version:
+                self._count('conflicts')
+                raise VersionConflict(kind, key, version)
+
+            new_document, result = mutation(thaw(document) if document is not None else None)
+            if result is False:
+                return result, version
+
+            try:
+                version = self.compare_and_swap(kind, key, version, new_document)
+            except VersionConflict:
+                if expected_version is not None:
+                    self._count('conflicts')
+                    raise
+                self._count('retries')
+                time.sleep(random.uniform(0, self.retry_backoff * (attempt + 1)))
+                continue
+
+            self._count('writes')
+            return result, version
+
+        self._count('conflicts')
+        raise VersionConflict(kind, key, self.get_document(kind, key)[1])
+
+    def occ_stats(self):
+        with self._occ_lock:
+            return dict(self._occ_stats)
+
+    def get_gallery(self, project_id):
+        return self.get_document('gallery', project_id)[0] or empty_gallery()
+
+    def add_custom_project(self, project):
+        return self.update_document('custom', project['id'], lambda current: (project, True))
+
+    def delete_custom_project(self, project_id, expected_version=None):
+        result = self.update_document('custom', project_id, lambda current: (None, True), expected_version)
+        self.update_document('gallery', project_id, _remove_mutation)
+        return result
+
+    def set_github_metadata(self, github_id, metadata, expected_version=None):
+        return self.update_document('github', github_id, lambda current: (metadata, True), expected_version)
+
+    def add_gallery_images(self, project_id, images, is_main=False, expected_version=None):
+        """Adiciona imagens à galeria; o resultado é o total de imagens do projeto"""
+        return self.update_document('gallery', project_id, _add_images_mutation(images, is_main), expected_version)
+
+    def delete_gallery_image(self, project_id, image_id, expected_version=None):
+        """Remove a imagem; resultado False se o projeto não tem galeria"""
+        return self.update_document('gallery', project_id, _delete_image_mutation(image_id), expected_version)
+
+    def set_main_image(self, project_id, image_id, expected_version=None):
+        """Define a imagem principal; resultado False se a imagem não existe"""
+        return self.update_document('gallery', project_id, _set_main_mutation(image_id), expected_version)
+
+    def replace_galleries(self, galleries):
+        """Troca as galerias informadas (ex.: na migração das imagens)"""
+        for project_id, gallery in galleries.items():
+            self.update_document('gallery', project_id, _put_mutation(gallery))
+
+
+class JsonProjectStore(ProjectStore):
+    """Backend original: snapshot JSON + log de alterações.
+
+    O estado é o snapshot (`portfolio_data.json`) mais os registros do log
+    (`portfolio_data.json.log`), reaplicados em ordem. Cada gravação de um
+    documento acrescenta um registro ao log ({"seq", "kind", "key",
+    "version", "value"}, com fsync), sem regravar o snapshot; a cada
+    `compact_every` registros (ou quando o log fica maior que o snapshot)
+    o estado é compactado num snapshot novo, gravado num temporário e
+    trocado com os.replace, e o log é esvaziado. O snapshot guarda o
+    número do último registro incluído (`_journal_seq`) e as versões dos
+    documentos (`_document_versions`), então uma queda entre a troca e o
+    esvaziamento não aplica nada duas vezes. Registros no formato antigo,
+    por operação ({"seq", "op", "args"}), são traduzidos na leitura.
+
+    O compare-and-swap acontece com o log travado (flock, entre workers):
+    alcança os registros dos outros workers, confere a versão do documento
+    e acrescenta o registro. A mutação em si roda fora da trava.
+
+    O estado decodificado fica em cache no processo, validado pela chave
+    (mtime_ns, tamanho, inode) do snapshot e pelo tamanho do log: enquanto
+    nada muda, `load()` devolve a mesma visão imutável; se outro worker
+    acrescentou registros, só o final do log é lido.
+    """
+
+    backend = 'json'
+
+    def __init__(self, path='portfolio_data.json', compact_every=500):
+        super().__init__()
+        self.path = path
+        self.compact_every = compact_every
+        self.log = ChangeLog(f"{path}.log")
+        self.parse_stats = ParseStats()
+        self._state = None
+        self._compactions = 0
+        self._lock = threading.RLock()
+
+    def _file_key(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _is_current(self, state, snapshot_key, log_stat):
+        return (
+            state is not None
+            and state['snapshot_key'] == snapshot_key
+            and state['log_stat'] == log_stat
+        )
+
+    def _current_state(self):
+        state = self._state
+        if self._is_current(state, self._file_key(), self.log.stat()):
+            self.parse_stats.record('cache_hits')
+            return state
+
+        with self._lock:
+            return self._refresh()
+
+    def load(self):
+        """Dados atuais (visão imutável; snapshot e log só são relidos quando mudam)"""
+        return self._current_state()['view']
+
+    def _read_snapshot(self):
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            self.parse_stats.record('parses')
+            self.parse_stats.record('bytes_parsed', len(raw))
+            data = json.loads(raw)
+            print(f"📂 Dados carregados: {len(data.get('custom_projects', []))} custom, {len(data.get('github_metadata', {}))} github meta")
+        except Exception as e:
+            print(f"📂 Criando arquivo de dados novo: {e}")
+            data = empty_project_data()
+        return data
+
+    def _refresh(self):
+        """Atualiza o estado em cache com o snapshot e o log (chamar com a trava)"""
+        state = self._state
+        snapshot_key = self._file_key()
+        log_stat = self.log.stat()
+        if self._is_current(state, snapshot_key, log_stat):
+            return state
+
+        incremental = (
+            state is not None
+            and state['snapshot_key'] == snapshot_key
+            and log_stat is not None
+            and state['log_stat'] is not None
+            and log_stat[0] == state['log_stat'][0]
+            and log_stat[1] >= state['log_offset']
+        )
+        if incremental:
+            # Mesmo snapshot: só os registros novos no fim do log
+            view = state['view']
+            versions = state['versions']
+            seq = state['seq']
+            offset = state['log_offset']
+            log_records = state['log_records']
+        else:
+            data = self._read_snapshot()
+            seq = data.pop('_journal_seq', 0)
+            versions = data.pop('_document_versions', {})
+            view = freeze(data)
+            offset = 0
+            log_records = 0
+
+        records, offset, read = self.log.read_from(offset)
+        if read:
+            self.parse_stats.record('parses')
+            self.parse_stats.record('bytes_parsed', read)
+
+        pending = [record for record in records if record['seq'] > seq]
+        if pending:
+            for record in pending:
+                for kind, key, version, value in log_record_puts(view, versions, record):
+                    view = put_document(view, kind, key, freeze(value))
+                    versions = put_version(versions, kind, key, version, value)
+            seq = pending[-1]['seq']
+            if not incremental:
+                print(f"📜 {len(pending)} alterações reaplicadas do log")
+
+        self._state = {
+            'snapshot_key': snapshot_key,
+            'log_stat': log_stat,
+            'log_offset': offset,
+            'log_records': log_records + len(records),
+            'seq': seq,
+            'versions': versions,
+            'view': view
+        }
+        return self._state
+
+    def _document_version(self, state, kind, key, document):
+        return document_version(state['versions'], kind, key, document)
+
+    def get_document(self, kind, key):
+        state = self._current_state()
+        document = find_document(state['view'], kind, key)
+        return document, self._document_version(state, kind, key, document)
+
+    def compare_and_swap(self, kind, key, expected_version, document):
+        """Grava o documento se ele ainda está em `expected_version`"""
+        with self._lock, self.log.locked():
+            # Alcança o que outros workers já registraram antes de comparar
+            state = self._refresh()
+            current = find_document(state['view'], kind, key)
+            version = self._document_version(state, kind, key, current)
+            if version != expected_version:
+                raise VersionConflict(kind, key, version)
+            if document is None and current is None:
+                return version
+
+            version += 1
+            seq = state['seq'] + 1
+            offset = self.log.append(
+                {'seq': seq, 'kind': kind, 'key': key, 'version': version, 'value': document},
+                state['log_offset']
+            )
+            self._state = {
+                'snapshot_key': state['snapshot_key'],
+                'log_stat': self.log.stat(),
+                'log_offset': offset,
+                'log_records': state['log_records'] + 1,
+                'seq': seq,
+                'versions': put_version(state['versions'], kind, key, version, document),
+                'view': put_document(state['view'], kind, key, freeze(document))
+            }
+            print(f"💾 Alteração registrada no log: {kind} {key} v{version} (#{seq})")
+
+            snapshot_size = state['snapshot_key'][1] if state['snapshot_key'] else 0
+            if self._state['log_records'] >= self.compact_every or offset > max(snapshot_size, 64 * 1024):
+                self._compact()
+            return version
+
+    def _compact(self):
+        # Chamar com as travas de compare_and_swap (ou compact())
+        state = self._state
+        write_atomic(self.path, {
+            **thaw(state['view']),
+            '_journal_seq': state['seq'],
+            '_document_versions': state['versions']
+        })
+        self.log.reset()
+        self._compactions += 1
+        self._state = {
+            **state,
+            'snapshot_key': self._file_key(),
+            'log_stat': self.log.stat(),
+            'log_offset': 0,
+            'log_records': 0
+        }
+        print(f"🗜️ Dados compactados em {self.path} (até a alteração #{state['seq']})")
+
+    def compact(self):
+        """Grava o estado atual num snapshot novo e esvazia o log"""
+        with self._lock, self.log.locked():
+            self._refresh()
+            self._compact()
+
+    def stamp(self):
+        """Identifica a versão dos dados (muda a cada alteração e a cada compactação)"""
+        key = self._file_key()
+        log_stat = self.log.stat()
+        if key is None and not log_stat:
+            return None
+        return [*(key or ()), log_stat[1] if log_stat else 0]
+
+    def stats(self):
+        state = self._state or {}
+        return {
+            'backend': self.backend,
+            **self.parse_stats.totals(),
+            **self.occ_stats(),
+            'seq': state.get('seq', 0),
+            'log_records': state.get('log_records', 0),
+            'log_bytes': state.get('log_offset', 0),
+            'compactions': self._compactions
+        }
+
+    def export(self):
+        return self.load()
+
+
+class SqliteProjectStore(ProjectStore):
+    """Dados locais no SQLite (WAL), indexados por projeto, categoria e módulo.
+
+    Cada gravação é uma transação curta que confere a versão do documento
+    (coluna `version`), grava só as linhas afetadas e incrementa um
+    contador geral (`stamp()`), usado para saber se os dados em memória
+    estão atualizados. `load()` remonta o mesmo formato do JSON e fica em
+    cache até o contador mudar.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path='portfolio_data.db'):
+        super().__init__()
+        self.path = path
+        self.parse_stats = ParseStats()
+        self._local = threading.local()
+        self._loaded = None
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+
+            CREATE TABLE IF NOT EXISTS custom_projects (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                category TEXT,
+                data TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_custom_projects_category ON custom_projects (category);
+
+            CREATE TABLE IF NOT EXISTS github_metadata (
+                github_id TEXT PRIMARY KEY,
+                category TEXT,
+                data TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_github_metadata_category ON github_metadata (category);
+
+            CREATE TABLE IF NOT EXISTS galleries (
+                project_id TEXT PRIMARY KEY,
+                main_image TEXT NOT NULL DEFAULT '',
+                version INTEGER NOT NULL DEFAULT 1
+            );
+
+            CREATE TABLE IF NOT EXISTS gallery_images (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL,
+                project_id TEXT NOT NULL REFERENCES galleries (project_id) ON DELETE CASCADE,
+                module TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_gallery_images_project ON gallery_images (project_id, id);
+            CREATE INDEX IF NOT EXISTS idx_gallery_images_module ON gallery_images (project_id, module);
+        ''')
+
+        # Bancos criados antes do versionamento dos documentos
+        for table in ('custom_projects', 'github_metadata', 'galleries'):
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+            if 'version' not in columns:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+
+    def _write(self, operation):
+        """Executa `operation(conn)` numa transação e incrementa a versão"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = operation(conn)
+            if result is not False:
+                conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return result
+
+    def version(self):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def stamp(self):
+        return ['sqlite', self.version()]
+
+    def stats(self):
+        return {'backend': self.backend, **self.parse_stats.totals(), **self.occ_stats(), 'version': self.version()}
+
+    def meta(self, key):
+        row = self._connect().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self._connect().execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def is_empty(self):
+        conn = self._connect()
+        return not any(
+            conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone()
+            for table in ('custom_projects', 'github_metadata', 'galleries')
+        )
+
+    def load(self):
+        """Todos os dados no formato do JSON (visão imutável, decodificada uma vez por versão)"""
+        version = self.version()
+        with self._lock:
+            if self._loaded and self._loaded[0] == version:
+                self.parse_stats.record('cache_hits')
+                return self._loaded[1]
+
+        conn = self._connect()
+        parsed = 0
+        conn.execute('BEGIN')
+        try:
+            version = self.version()
+            custom_projects = []
+            for (data,) in conn.execute('SELECT data FROM custom_projects ORDER BY seq'):
+                custom_projects.append(json.loads(data))
+                parsed += len(data)
+            github_metadata = {}
+            for github_id, data in conn.execute('SELECT github_id, data FROM github_metadata'):
+                github_metadata[github_id] = json.loads(data)
+                parsed += len(data)
+            galleries = {
+                project_id: {'main_image': main_image, 'images': [], 'modules': {}}
+                for project_id, main_image in conn.execute('SELECT project_id, main_image FROM galleries')
+            }
+            for project_id, module, data in conn.execute(
+                'SELECT project_id, module, data FROM gallery_images ORDER BY seq'
+            ):
+                image = json.loads(data)
+                parsed += len(data)
+                gallery = galleries[project_id]
+                gallery['images'].append(image)
+                gallery['modules'].setdefault(module, []).append(image)
+        finally:
+            conn.execute('COMMIT')
+
+        self.parse_stats.record('parses')
+        self.parse_stats.record('bytes_parsed', parsed)
+        data = freeze({
+            'custom_projects': custom_projects,
+            'github_metadata': github_metadata,
+            'project_galleries': galleries
+        })
+        print(f"📂 Dados carregados do SQLite (versão {version}): {len(custom_projects)} custom, {len(github_metadata)} github meta")
+        with self._lock:
+            self._loaded = (version, data)
+        return data
+
+    def export(self):
+        return self.load()
+
+    def _document_version(self, conn, kind, key):
+        if kind == 'custom':
+            row = conn.execute('SELECT version FROM custom_projects WHERE id = ?', (key,)).fetchone()
+        elif kind == 'github':
+            row = conn.execute('SELECT version FROM github_metadata WHERE github_id = ?', (key,)).fetchone()
+        else:
+            row = conn.execute('SELECT version FROM galleries WHERE project_id = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def get_document(self, kind, key):
+        conn = self._connect()
+        if kind == 'custom':
+            row = conn.execute('SELECT data, version FROM custom_projects WHERE id = ?', (key,)).fetchone()
+            return (json.loads(row[0]), row[1]) if row else (None, 0)
+        if kind == 'github':
+            row = conn.execute('SELECT data, version FROM github_metadata WHERE github_id = ?', (key,)).fetchone()
+            return (json.loads(row[0]), row[1]) if row else (None, 0)
+
+        # Galeria: linha da galeria + linhas das imagens, lidas na mesma transação
+        conn.execute('BEGIN')
+        try:
+            row = conn.execute('SELECT main_image, version FROM galleries WHERE project_id = ?', (key,)).fetchone()
+            if row is None:
+                return None, 0
+            gallery = {'main_image': row[0], 'images': [], 'modules': {}}
+            for module, data in conn.execute(
+                'SELECT module, data FROM gallery_images WHERE project_id = ? ORDER BY seq', (key,)
+            ):
+                image = json.loads(data)
+                gallery['images'].append(image)
+                gallery['modules'].setdefault(module, []).append(image)
+            return gallery, row[1]
+        finally:
+            conn.execute('COMMIT')
+
+    def compare_and_swap(self, kind, key, expected_version, document):
+        """Grava o documento se ele ainda está em `expected_version` (só as linhas que mudaram)"""
+        def operation(conn):
+            version = self._document_version(conn, kind, key)
+            if version != expected_version:
+                raise VersionConflict(kind, key, version)
+            if document is None and version == 0:
+                return False
+
+            if kind == 'custom':
+                self._put_custom_project(conn, key, document, version + 1)
+            elif kind == 'github':
+                self._put_github_metadata(conn, key, document, version + 1)
+            else:
+                self._put_gallery(conn, key, document, version + 1)
+            return version + 1
+
+        version = self._write(operation)
+        return expected_version if version is False else version
+
+    def _put_custom_project(self, conn, project_id, project, version):
+        if project is None:
+            conn.execute('DELETE FROM custom_projects WHERE id = ?', (project_id,))
+            return
+        conn.execute(
+            '''
+            INSERT INTO custom_projects (id, category, data, version) VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET category = excluded.category, data = excluded.data, version = excluded.version
+            ''',
+            (project_id, project.get('category'), json.dumps(project, ensure_ascii=False), version)
+        )
+
+    def _put_github_metadata(self, conn, github_id, metadata, version):
+        if metadata is None:
+            conn.execute('DELETE FROM github_metadata WHERE github_id = ?', (github_id,))
+            return
+        conn.execute(
+            '''
+            INSERT INTO github_metadata (github_id, category, data, version) VALUES (?, ?, ?, ?)
+            ON CONFLICT(github_id) DO UPDATE SET category = excluded.category, data = excluded.data, version = excluded.version
+            ''',
+            (github_id, metadata.get('category'), json.dumps(metadata, ensure_ascii=False), version)
+        )
+
+    def _put_gallery(self, conn, project_id, gallery, version):
+        if gallery is None:
+            conn.execute('DELETE FROM galleries WHERE project_id = ?', (project_id,))
+            return
+        conn.execute(
+            '''
+            INSERT INTO galleries (project_id, main_image, version) VALUES (?, ?, ?)
+            ON CONFLICT(project_id) DO UPDATE SET main_image = excluded.main_image, version = excluded.version
+            ''',
+            (project_id, gallery.get('main_image', ''), version)
+        )
+
+        # Só as imagens que entraram, saíram ou mudaram
+        existing = dict(conn.execute(
+            'SELECT id, data FROM gallery_images WHERE project_id = ?', (project_id,)
+        ).fetchall())
+        kept = set()
+        for image in gallery.get('images', []):
+            data = json.dumps(image, ensure_ascii=False)
+            kept.add(image.get('id'))
+            if image.get('id') not in existing:
+                conn.execute(
+                    'INSERT INTO gallery_images (id, project_id, module, data) VALUES (?, ?, ?, ?)',
+                    (image.get('id'), project_id, image_module(image, gallery), data)
+                )
+            elif existing[image.get('id')] != data:
+                conn.execute(
+                    'UPDATE gallery_images SET module = ?, data = ? WHERE project_id = ? AND id = ?',
+                    (image_module(image, gallery), data, project_id, image.get('id'))
+                )
+        for image_id in existing.keys() - kept:
+            conn.execute('DELETE FROM gallery_images WHERE project_id = ? AND id = ?', (project_id, image_id))
+
+    def _insert_gallery(self, conn, project_id, gallery):
+        conn.execute('DELETE FROM galleries WHERE project_id = ?', (project_id,))
+        conn.execute(
+            'INSERT INTO galleries (project_id, main_image) VALUES (?, ?)',
+            (project_id, gallery.get('main_image', ''))
+        )
+        for image in gallery.get('images', []):
+            conn.execute(
+                'INSERT INTO gallery_images (id, project_id, module, data) VALUES (?, ?, ?, ?)',
+                (image.get('id'), project_id, image_module(image, gallery), json.dumps(image, ensure_ascii=False))
+            )
+
+    def import_data(self, data, source=None):
+        """Copia um documento no formato do JSON para as tabelas (migração).
+
+        Com `source`, registra em meta ('migrated_from_json') na mesma transação.
+        """
+        def operation(conn):
+            if source is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)", (source,)
+                )
+            for project in data.get('custom_projects', []):
+                conn.execute(
+                    'INSERT OR REPLACE INTO custom_projects (id, category, data) VALUES (?, ?, ?)',
+                    (project['id'], project.get('category'), json.dumps(project, ensure_ascii=False))
+                )
+            for github_id, metadata in data.get('github_metadata', {}).items():
+                conn.execute(
+                    'INSERT OR REPLACE INTO github_metadata (github_id, category, data) VALUES (?, ?, ?)',
+                    (github_id, metadata.get('category'), json.dumps(metadata, ensure_ascii=False))
+                )
+            for project_id, gallery in data.get('project_galleries', {}).items():
+                self._insert_gallery(conn, project_id, gallery)
+        self._write(operation)
+
+
+def migrate_json_to_sqlite(json_path, store):
+    """Migração única: importa o JSON (snapshot + log) se o banco ainda estiver vazio.
+
+    A migração fica registrada em meta ('migrated_from_json'): um banco que
+    ficou vazio depois (projetos apagados) não importa o JSON de novo.
+    """
+    if store.meta('migrated_from_json') is not None:
+        return False
+    if not store.is_empty():
+        # Banco migrado antes do registro em meta
+        store.set_meta('migrated_from_json', json_path)
+        return False
+    if not os.path.exists(json_path):
+        return False
+
+    data = thaw(JsonProjectStore(json_path).load())
+
+    store.import_data(data, source=json_path)
+    images = sum(len(gallery.get('images', [])) for gallery in data.get('project_galleries', {}).values())
+    print(f"🗄️ Migrado {json_path} → {store.path}: {len(data.get('custom_projects', []))} custom, "
+          f"{len(data.get('github_metadata', {}))} github meta, {images} imagens")
+    return True
+
+
+def open_project_store(backend, json_path, sqlite_path, compact_every=500):
+    """Abre o backend configurado (PROJECT_STORE_BACKEND)"""
+    if backend == 'sqlite':
+        store = SqliteProjectStore(sqlite_path)
+        migrate_json_to_sqlite(json_path, store)
+        return store
+    if backend != 'json':
+        print(f"⚠️ PROJECT_STORE_BACKEND={backend} desconhecido - usando json")
+    store = JsonProjectStore(json_path, compact_every)
+    # Reaplica o log já na inicialização (e não na primeira requisição)
+    store.load()
+    return store
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Armazenamento dos dados do portfólio')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate = subparsers.add_parser('migrate', help='importa o JSON para o SQLite')
+    migrate.add_argument('json_path', nargs='?', default='portfolio_data.json')
+    migrate.add_argument('sqlite_path', nargs='?', default='portfolio_data.db')
+    args = parser.parse_args()
+
+    if not migrate_json_to_sqlite(args.json_path, SqliteProjectStore(args.sqlite_path)):
+        print(f"🗄️ Nada a migrar ({args.json_path} não existe ou {args.sqlite_path} já foi migrado)")
@@ -0,0 +1,246 @@
+import threading
+from collections.abc import Sequence
+
+from project_processing import fingerprint, get_project_gallery
+from project_record import ProjectRecord
+
+CATEGORIES = ['sistema', 'rpa', 'api', 'web', 'mobile', 'outros']
+
+
+def project_sort_key(project):
+    """Ordem dentro de cada categoria (decrescente); o id desempata"""
+    return (not project.get('featured', False), project.get('updated_at') or '', project['id'])
+
+
+class SortedProjectIndex(Sequence):
+    """Projetos de uma categoria sempre na ordem de exibição.
+
+    Os itens ficam guardados já ordenados (decrescente por
+    `project_sort_key`), junto com as chaves. Inserir, remover ou mover um
+    projeto é uma busca binária (O(log n) comparações) mais um
+    `list.insert`/`pop`, sem reordenar a categoria. Iterar, fatiar e `len()`
+    são os da própria lista, então templates e geradores de currículo usam
+    o índice como se fosse uma lista.
+    """
+
+    def __init__(self, projects=()):
+        self._items = sorted(projects, key=project_sort_key, reverse=True)
+        self._keys = [project_sort_key(project) for project in self._items]
+
+    def _position(self, key):
+        # Primeira posição cuja chave é menor que `key` (lista decrescente)
+        keys = self._keys
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if keys[mid] > key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, project):
+        key = project_sort_key(project)
+        position = self._position(key)
+        self._keys.insert(position, key)
+        self._items.insert(position, project)
+
+    def remove(self, project):
+        key = project_sort_key(project)
+        position = self._position(key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._items[position]
+
+    def update(self, added=(), removed=()):
+        """Aplica várias mudanças; muitas de uma vez viram uma ordenação só"""
+        if len(added) > 64 and len(added) * 4 > len(self._items):
+            removed_ids = {project['id'] for project in removed}
+            self.__init__([p for p in self._items if p['id'] not in removed_ids] + list(added))
+            return
+
+        for project in removed:
+            self.remove(project)
+        for project in added:
+            self.add(project)
+
+    def copy(self):
+        index = SortedProjectIndex.__new__(SortedProjectIndex)
+        index._items = list(self._items)
+        index._keys = list(self._keys)
+        return index
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __repr__(self):
+        return f"SortedProjectIndex({len(self._items)} projetos)"
+
+
+def decorate_custom_project(project, galleries):
+    """Cópia do projeto customizado com os dados da galeria"""
+    gallery = get_project_gallery(project['id'], galleries)
+    return ProjectRecord(
+        project,
+        main_image=gallery.get('main_image', project.get('image', '')),
+        gallery=gallery.get('images', []),
+        modules=gallery.get('modules', {})
+    )
+
+
+def project_languages(project):
+    """Bytes por linguagem que o projeto soma no total (ver aggregate_language_bytes)"""
+    languages = project.get('languages') or {}
+    if languages:
+        return languages
+    primary = project.get('language')
+    if primary and primary != 'N/A':
+        return {primary: 0}
+    return {}
+
+
+class ProjectView:
+    """Visão materializada dos projetos por categoria, com estatísticas.
+
+    `refresh()` recebe os projetos atuais e aplica só as diferenças em
+    relação à visão anterior: projetos novos/alterados/removidos são
+    movidos no índice ordenado da sua categoria (SortedProjectIndex) e
+    nos totais por linguagem. A leitura (`current()`) devolve a visão pronta, sem
+    percorrer os projetos.
+
+    Cada visão publicada é imutável: uma atualização copia os índices das
+    categorias alteradas antes de mexer neles e troca a visão inteira de
+    uma vez, então quem está renderizando a anterior não é afetado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._projects = {}
+        self._custom_keys = {}
+        self._language_bytes = {}
+        self._language_projects = {}
+        self._stats = {'refreshes': 0, 'changed_projects': 0, 'updated_categories': 0}
+        self._view = self._build_view(None, {}, {category: SortedProjectIndex() for category in CATEGORIES}, [])
+
+    def current(self):
+        return self._view
+
+    def refresh(self, source, user, github_projects, custom_projects, galleries):
+        """Atualiza a visão para `source` aplicando só o que mudou"""
+        with self._lock:
+            previous = self._view
+            custom = self._decorate_custom(custom_projects, galleries)
+            all_projects = github_projects + custom
+
+            changed = []
+            current_ids = set()
+            for project in all_projects:
+                current_ids.add(project['id'])
+                old = self._projects.get(project['id'])
+                if old is not project and old != project:
+                    changed.append((old, project))
+
+            removed = [old for project_id, old in self._projects.items() if project_id not in current_ids]
+
+            if not changed and not removed:
+                # Mesmo conteúdo (ex.: arquivo regravado sem mudanças)
+                self._view = {**previous, 'source': source, 'user': user, 'all_projects': all_projects}
+                self._stats['refreshes'] += 1
+                return self._view
+
+            dirty = {}
+            for old, new in changed:
+                if old is not None:
+                    self._remove(old, dirty)
+                self._add(new, dirty)
+            for old in removed:
+                self._remove(old, dirty)
+
+            # Copy-on-write: só as categorias alteradas ganham um índice novo
+            categorized = dict(previous['projects'])
+            for category, (removed_projects, added) in dirty.items():
+                index = categorized[category].copy()
+                index.update(added, removed_projects)
+                categorized[category] = index
+
+            self._stats['refreshes'] += 1
+            self._stats['changed_projects'] += len(changed) + len(removed)
+            self._stats['updated_categories'] += len(dirty)
+            self._view = self._build_view(source, user, categorized, all_projects)
+            return self._view
+
+    def _decorate_custom(self, custom_projects, galleries):
+        decorated = []
+        keys = {}
+        for project in custom_projects:
+            key = fingerprint([project, galleries.get(project['id'])])
+            keys[project['id']] = key
+            old = self._projects.get(project['id'])
+            if old is not None and self._custom_keys.get(project['id']) == key:
+                decorated.append(old)
+            else:
+                decorated.append(decorate_custom_project(project, galleries))
+        self._custom_keys = keys
+        return decorated
+
+    def _add(self, project, dirty):
+        category = project.get('category', 'outros')
+        if category not in CATEGORIES:
+            category = 'outros'
+        dirty.setdefault(category, ([], []))[1].append(project)
+        self._projects[project['id']] = project
+
+        for language, size in project_languages(project).items():
+            self._language_bytes[language] = self._language_bytes.get(language, 0) + size
+            self._language_projects[language] = self._language_projects.get(language, 0) + 1
+
+    def _remove(self, project, dirty):
+        category = project.get('category', 'outros')
+        if category not in CATEGORIES:
+            category = 'outros'
+        dirty.setdefault(category, ([], []))[0].append(project)
+        self._projects.pop(project['id'], None)
+
+        for language, size in project_languages(project).items():
+            self._language_bytes[language] -= size
+            self._language_projects[language] -= 1
+            if not self._language_projects[language]:
+                del self._language_projects[language]
+                del self._language_bytes[language]
+
+    def _build_view(self, source, user, categorized, all_projects):
+        total_bytes = sum(self._language_bytes.values())
+        language_bytes = [
+            {
+                'language': language,
+                'bytes': size,
+                'percent': round(size * 100 / total_bytes, 1) if total_bytes else 0
+            }
+            for language, size in sorted(self._language_bytes.items(), key=lambda item: item[1], reverse=True)
+        ]
+        return {
+            'source': source,
+            'user': user,
+            'projects': categorized,
+            'all_projects': all_projects,
+            'language_bytes': language_bytes,
+            'stats': {
+                'systems': len(categorized['sistema']),
+                'rpa': len(categorized['rpa']),
+                'total': len(all_projects),
+                'languages': len(language_bytes)
+            }
+        }
+
+    def stats(self):
+        view = self._view
+        return {**self._stats, 'projects': view['stats']['total'], 'source': view['source']}
@@ -1,5 +1,6 @@
 from datetime import datetime
 import json
+from github_languages import aggregate_language_bytes
 
 try:
     from weasyprint import HTML, CSS
@@ -58,6 +59,9 @@ def generate_complete_resume(user_data, categorized_projects, all_projects):
         "🌟 Liderança técnica e mentoria de desenvolvedores juniores"
     ]
     
+    # Bytes por linguagem somados de todos os repositórios
+    language_bytes = {item['language']: item['bytes'] for item in aggregate_language_bytes(all_projects)}
+    
     # Estatísticas expandidas
     stats = {
         'total_projects': len(all_projects),
@@ -66,7 +70,7 @@ def generate_complete_resume(user_data, categorized_projects, all_projects):
         'apis': len(categorized_projects['api']),
         'web': len(categorized_projects['web']),
         'mobile': len(categorized_projects['mobile']),
-        'languages': len(set([p.get('language', 'N/A') for p in all_projects if p.get('language') and p.get('language') != 'N/A'])),
+        'languages': len(language_bytes),
         'years_experience': 5,
         'companies_served': 10,
         'automation_hours_saved': 2000
@@ -530,7 +534,7 @@ def generate_complete_resume(user_data, categorized_projects, all_projects):
                         <div class="tech-list">"""
         
         for tech in techs:
-            count = language_count.get(tech, 0)
+            count = language_count.get(tech, 0) or language_bytes.get(tech, 0)
             if count > 0 or tech in ['Docker', 'Git', 'Linux', 'PostgreSQL', 'HTML', 'CSS']:
                 html_content += f'<div class="tech-item">{tech}</div>'
         
@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+
+
+class SnapshotStore:
+    """Cache de snapshots compartilhado entre os workers do gunicorn.
+
+    Cada snapshot fica em uma linha do SQLite (modo WAL) com um contador de
+    versão. Os workers consultam só a versão (uma leitura de índice) e
+    decodificam o payload uma única vez por versão publicada.
+    """
+
+    def __init__(self, path='portfolio_cache.db'):
+        self.path = path
+        self._local = threading.local()
+        self._decoded = {}
+        self._decoders = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'loads': 0, 'publishes': 0}
+        self._init_db()
+
+    def _connect(self):
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        self._connect().execute('''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+    def register_decoder(self, name, decoder):
+        """Converte o valor de `name` depois do json.loads (uma vez por versão)"""
+        self._decoders[name] = decoder
+
+    def version(self, name):
+        """Versão atual do snapshot (0 se nunca publicado)"""
+        row = self._connect().execute(
+            'SELECT version FROM snapshots WHERE name = ?', (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, name):
+        """Retorna (versão, valor); decodifica só quando a versão muda"""
+        current = self.version(name)
+        if current == 0:
+            return 0, None
+
+        with self._lock:
+            cached = self._decoded.get(name)
+            if cached and cached[0] == current:
+                self._stats['hits'] += 1
+                return cached
+
+        row = self._connect().execute(
+            'SELECT version, payload FROM snapshots WHERE name = ?', (name,)
+        ).fetchone()
+        if not row:
+            return 0, None
+
+        value = json.loads(row[1])
+        decoder = self._decoders.get(name)
+        if decoder:
+            value = decoder(value)
+
+        entry = (row[0], value)
+        with self._lock:
+            self._decoded[name] = entry
+            self._stats['loads'] += 1
+        return entry
+
+    def publish(self, name, value):
+        """Grava um novo valor e incrementa a versão; retorna a nova versão"""
+        payload = json.dumps(value, ensure_ascii=False, default=encode_value)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT INTO snapshots (name, version, payload, updated_at)
+                VALUES (?, 1, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    version = version + 1,
+                    payload = excluded.payload,
+                    updated_at = excluded.updated_at
+            ''', (name, payload, time.time()))
+            version = conn.execute(
+                'SELECT version FROM snapshots WHERE name = ?', (name,)
+            ).fetchone()[0]
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        with self._lock:
+            self._decoded[name] = (version, value)
+            self._stats['publishes'] += 1
+        return version
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                'path': self.path,
+                'decoded': {name: entry[0] for name, entry in self._decoded.items()}
+            }
+
+
+def encode_value(value):
+    """Objetos com to_dict() (ex.: ProjectRecord) e outros Mappings viram dicionários no JSON"""
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is None:
+        if isinstance(value, Mapping):
+            return dict(value)
+        raise TypeError(f"{type(value).__name__} não é serializável em JSON")
+    return to_dict()
@@ -0,0 +1,145 @@
+"""Single-flight: muitas requisições simultâneas, uma única busca.
+
+Uso:
+    python -m pytest tests/test_single_flight.py
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cache import SingleFlight
+
+THREADS = 20
+
+
+def run_concurrently(fn, count=THREADS):
+    """Chama `fn` em `count` threads liberadas ao mesmo tempo; retorna (resultados, erros)"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return results, errors
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return object()
+
+    results, errors = run_concurrently(lambda: flight.do('github', fetch))
+
+    assert len(calls) == 1
+    assert errors == [None] * THREADS
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'executions': 1, 'shared': THREADS - 1, 'in_flight': []}
+
+
+def test_concurrent_callers_share_the_exception():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        raise RuntimeError('GitHub fora do ar')
+
+    results, errors = run_concurrently(lambda: flight.do('github', fetch))
+
+    assert len(calls) == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert all(error is errors[0] for error in errors)
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    calls = []
+
+    @flight.wrap('github')
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert fetch() == 1
+    assert fetch() == 2
+    assert flight.stats()['executions'] == 2
+
+
+@pytest.fixture(scope='module')
+def portfolio(tmp_path_factory):
+    """O app apontado para o GitHub falso, num diretório de trabalho temporário"""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:
+        pytest.skip(f"weasyprint indisponível: {e}")
+
+    from fake_github import FakeGitHub
+
+    fake = FakeGitHub(repo_count=30)
+    url = fake.start()
+    previous_cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('app'))
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('GITHUB_API_URL', url)
+        patch.setenv('GITHUB_TOKEN', '')
+        patch.setenv('GITHUB_SYNC_INTERVAL', '3600')
+        patch.setenv('GITHUB_FETCH_LANGUAGES', 'false')
+        patch.setenv('CATEGORY_RULES_FILE', os.path.join(ROOT, 'category_rules.json'))
+        try:
+            import app
+
+            deadline = time.time() + 30
+            while not app.github_sync.snapshot() and time.time() < deadline:
+                time.sleep(0.1)
+            assert app.github_sync.snapshot(), 'a primeira sincronização não terminou'
+            yield app, fake
+        finally:
+            os.chdir(previous_cwd)
+            fake.stop()
+
+
+def test_process_github_projects_fetches_once(portfolio, monkeypatch):
+    app, fake = portfolio
+    fetches = []
+    get_github_data = app.get_github_data
+
+    def counting_get_github_data():
+        fetches.append(threading.get_ident())
+        time.sleep(0.2)
+        return get_github_data()
+
+    monkeypatch.setattr(app, 'get_github_data', counting_get_github_data)
+    # Snapshot processado de outra origem: a próxima chamada precisa processar tudo
+    app.snapshot_store.publish('github_projects', {'source': None, 'user': {}, 'projects': []})
+    requests_before = fake.requests
+
+    results, errors = run_concurrently(app.process_github_projects)
+
+    assert len(fetches) == 1
+    assert errors == [None] * THREADS
+    assert all(result is results[0] for result in results)
+    assert len(results[0][1]) == 30
+    # Os dados vêm do snapshot da sincronização, sem chamadas ao GitHub
+    assert fake.requests == requests_before